@@ -1 +1,327 @@
--
+# app.py
+"""Batch CLI: parse banyak PDF BRI sekaligus tanpa Streamlit.
+
+Contoh:
+    python app.py statements/ -o output/ -j 16
+    python app.py "arsip/2024-*/**/*.pdf" -o output/ --no-cache
+"""
+import argparse
+import csv
+import glob
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from bri_cache import DEFAULT_CACHE_DIR, DEFAULT_CACHE_MAX_BYTES, StatementCache
+from bri_export import EXPORT_FORMATS, write_excel_workbook, write_table_files
+from bri_parser import HEADER_REGION_CHARS, parse_bri_statement
+from bri_pdf import available_cpus
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_FIELDS = [
+    "file", "status", "detected_format", "rows", "pages", "cache", "account_name", "account_number",
+    "output", "seconds", "error",
+]
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# ============== Logging ==============
+
+class JsonLogFormatter(logging.Formatter):
+    """Satu objek JSON per baris; field ``extra=`` seperti event/metrics ikut ditulis."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key in ("event", "metrics"):
+            if hasattr(record, key):
+                entry[key] = getattr(record, key)
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+def configure_logging(level: int = logging.WARNING, json_logs: bool = False) -> None:
+    """Log ke stderr; juga dipanggil di tiap worker supaya setelan sama dengan proses utama."""
+    handler = logging.StreamHandler()
+    handler.setFormatter(JsonLogFormatter() if json_logs else logging.Formatter(LOG_FORMAT))
+    logging.basicConfig(level=level, handlers=[handler], force=True)
+
+# ============== Input Discovery ==============
+
+def collect_pdfs(inputs: List[str]) -> List[Path]:
+    """Expand folder / glob / file menjadi daftar PDF unik, urut sesuai input."""
+    found, seen = [], set()
+    for item in inputs:
+        if os.path.isdir(item):
+            candidates = sorted(p for p in Path(item).iterdir() if p.suffix.lower() == ".pdf")
+        elif glob.has_magic(item):
+            candidates = sorted(Path(p) for p in glob.glob(item, recursive=True) if p.lower().endswith(".pdf"))
+        else:
+            candidates = [Path(item)]
+        for p in candidates:
+            key = p.resolve()
+            if key not in seen:
+                seen.add(key)
+                found.append(p)
+    return found
+
+# ============== Worker ==============
+
+def process_file(pdf_path: Path, out_dir: Path, out_stem: str, cache_dir: Optional[str], cache_max_bytes: int,
+                 integer_cents: bool = False, formats: Sequence[str] = ("xlsx",),
+                 profile_dir: Optional[str] = None, header_chars: Optional[int] = HEADER_REGION_CHARS,
+                 pdf_workers: int = 1) -> Dict:
+    """Parse satu PDF dan tulis output-nya; dijalankan di process pool.
+
+    xlsx -> <out_stem>.xlsx; parquet / csv.gz -> folder <out_stem>/ berisi satu file per tabel.
+    pdf_workers > 1 -> halaman dokumen panjang didekode paralel (lihat default_pdf_workers).
+    """
+    start = time.perf_counter()
+    row = _blank_row(pdf_path)
+    try:
+        cache = StatementCache(cache_dir, cache_max_bytes) if cache_dir else None
+        result = parse_bri_statement(str(pdf_path), pdf_path.name, cache=cache, pdf_workers=pdf_workers,
+                                     integer_cents=integer_cents, profile_dir=profile_dir,
+                                     header_chars=header_chars)
+        personal_df, _, trx_df, _, _ = result
+
+        outputs = []
+        for fmt in formats:
+            if fmt == "xlsx":
+                out_path = out_dir / f"{out_stem}.xlsx"
+                write_excel_workbook(out_path, *result, integer_cents=integer_cents)
+                outputs.append(str(out_path))
+            else:
+                write_table_files(out_dir / out_stem, result, fmt)
+                outputs.append(str(out_dir / out_stem / f"*.{fmt}"))
+
+        row.update({
+            "detected_format": personal_df.at[0, "Detected Format"],
+            "rows": len(trx_df),
+            "pages": result.metrics["pages"],
+            "cache": result.metrics["cache"],
+            "account_name": personal_df.at[0, "Account Name"] or "",
+            "account_number": personal_df.at[0, "Account Number"] or "",
+            "output": ";".join(outputs),
+        })
+        if trx_df.empty:
+            row["status"] = "empty"
+    except Exception as e:
+        row.update({"status": "error", "error": f"{type(e).__name__}: {e}"})
+    row["seconds"] = round(time.perf_counter() - start, 3)
+    return row
+
+def _blank_row(pdf_path: Path) -> Dict:
+    return {"file": str(pdf_path), "status": "ok", "detected_format": "", "rows": 0, "pages": 0, "cache": "",
+            "account_name": "", "account_number": "", "output": "", "seconds": 0.0, "error": ""}
+
+def _error_row(pdf_path: Path, error: str) -> Dict:
+    row = _blank_row(pdf_path)
+    row.update({"status": "error", "error": error})
+    return row
+
+def output_stems(pdfs: List[Path]) -> Dict[Path, str]:
+    """Nama output per PDF; nama file yang sama dari folder berbeda diberi akhiran _2, _3, ...
+
+    Akhiran dinaikkan sampai tidak bentrok dengan nama yang sudah dibagikan maupun nama
+    asli PDF lain (d1/a.pdf, d2/a.pdf, d3/a_2.pdf -> a, a_3, a_2). Perbandingan tanpa
+    membedakan huruf besar/kecil karena sistem file Windows/macOS juga begitu.
+    """
+    real = {p.stem.casefold() for p in pdfs}
+    stems, taken = {}, set()
+    for p in pdfs:
+        stem, n = p.stem, 1
+        while stem.casefold() in taken or (n > 1 and stem.casefold() in real):
+            n += 1
+            stem = f"{p.stem}_{n}"
+        taken.add(stem.casefold())
+        stems[p] = stem
+    return stems
+
+# ============== Main ==============
+
+def run_batch(pdfs: List[Path], out_dir: Path, jobs: int, cache_dir: Optional[str],
+              cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES, integer_cents: bool = False,
+              formats: Sequence[str] = ("xlsx",), log_level: int = logging.WARNING,
+              json_logs: bool = False, profile_dir: Optional[str] = None,
+              header_chars: Optional[int] = HEADER_REGION_CHARS, pdf_workers: int = 1) -> List[Dict]:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rows: Dict[Path, Dict] = {}
+    stems = output_stems(pdfs)
+    total = len(pdfs)
+
+    if jobs <= 1:
+        for i, p in enumerate(pdfs, 1):
+            rows[p] = process_file(p, out_dir, stems[p], cache_dir, cache_max_bytes, integer_cents, formats,
+                                   profile_dir, header_chars, pdf_workers)
+            _report(i, total, rows[p])
+    else:
+        def task(p: Path) -> tuple:
+            return (process_file, p, out_dir, stems[p], cache_dir, cache_max_bytes, integer_cents, formats,
+                    profile_dir, header_chars, pdf_workers)
+
+        def finish(p: Path, row: Dict) -> None:
+            rows[p] = row
+            _report(len(rows), total, row)
+
+        queue = deque(pdfs)
+        try:
+            while queue:
+                suspects = _run_pool(queue, jobs, task, finish, log_level, json_logs)
+                # Worker mati membuat semua future yang sedang jalan gagal; jalankan ulang satu per satu
+                # supaya hanya PDF penyebabnya yang dicatat error, lalu lanjut dengan pool baru
+                for p in suspects:
+                    finish(p, _run_isolated(task(p), log_level, json_logs))
+        except Exception as e:
+            logger.exception("Batch aborted")
+            for p in pdfs:
+                if p not in rows:
+                    finish(p, _error_row(p, f"not processed: {type(e).__name__}: {e}"))
+
+    return [rows[p] for p in pdfs]
+
+def _pool(jobs: int, log_level: int, json_logs: bool) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=jobs, initializer=configure_logging, initargs=(log_level, json_logs))
+
+def _run_pool(queue: deque, jobs: int, task, finish, log_level: int, json_logs: bool) -> List[Path]:
+    """Proses antrean dengan paling banyak `jobs` file berjalan; berhenti kalau pool rusak.
+
+    Mengembalikan file yang sedang berjalan saat pool rusak (salah satunya penyebabnya).
+    """
+    suspects: List[Path] = []
+    with _pool(jobs, log_level, json_logs) as pool:
+        in_flight: Dict = {}
+        while (queue or in_flight) and not suspects:
+            try:
+                while queue and len(in_flight) < jobs:
+                    p = queue[0]
+                    in_flight[pool.submit(*task(p))] = p
+                    queue.popleft()
+            except BrokenProcessPool:
+                if not in_flight:
+                    break  # pool rusak sebelum ada yang jalan; antrean dilanjutkan dengan pool baru
+                # future yang sudah disubmit akan ikut gagal di bawah
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            if any(isinstance(f.exception(), BrokenProcessPool) for f in done):
+                done, _ = wait(in_flight)
+            for fut in done:
+                p = in_flight.pop(fut)
+                try:
+                    finish(p, fut.result())
+                except BrokenProcessPool:
+                    suspects.append(p)
+                except Exception as e:
+                    finish(p, _error_row(p, f"{type(e).__name__}: {e}"))
+    return suspects
+
+def _run_isolated(task: tuple, log_level: int, json_logs: bool) -> Dict:
+    """Jalankan satu file di pool satu worker; worker yang mati menjadi baris error file itu."""
+    pdf_path = task[1]
+    try:
+        with _pool(1, log_level, json_logs) as pool:
+            return pool.submit(*task).result()
+    except BrokenProcessPool:
+        return _error_row(pdf_path, "BrokenProcessPool: worker process died while parsing this file")
+    except Exception as e:
+        return _error_row(pdf_path, f"{type(e).__name__}: {e}")
+
+def _report(i: int, total: int, row: Dict) -> None:
+    detail = row["error"] if row["status"] == "error" else f"{row['detected_format']} rows={row['rows']}"
+    print(f"[{i}/{total}] {row['status']:<5} {row['file']} ({row['seconds']:.2f}s) {detail}", flush=True)
+
+def write_summary(rows: List[Dict], path: Path) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def default_pdf_workers(jobs: int, n_files: int) -> int:
+    """CPU yang tidak terpakai oleh paralelisme per file dibagi untuk dekode halaman.
+
+    -j 1, batch yang lebih kecil dari jumlah CPU, atau satu statement besar tetap bisa
+    memakai semua CPU; batch penuh (jobs >= CPU) -> 1 worker halaman per file.
+    """
+    return max(1, available_cpus() // max(1, min(jobs, n_files)))
+
+def _positive_int(value: str) -> int:
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {n}")
+    return n
+
+def _non_negative_int(value: str) -> int:
+    n = int(value)
+    if n < 0:
+        raise argparse.ArgumentTypeError(f"must be >= 0, got {n}")
+    return n
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(description="Batch-parse BRI PDF statements to Excel, Parquet or CSV.")
+    ap.add_argument("inputs", nargs="+", help="PDF file, folder, or glob pattern (quote globs)")
+    ap.add_argument("-o", "--output-dir", default="output", help="folder for per-file outputs (default: output)")
+    ap.add_argument("-j", "--jobs", type=int, default=available_cpus(),
+                    help="number of files parsed in parallel (default: CPUs available to this process)")
+    ap.add_argument("--pdf-workers", type=_positive_int, metavar="N",
+                    help="processes decoding the pages of one long PDF (default: available CPUs // "
+                         "min(jobs, number of files))")
+    ap.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR), help="on-disk parse cache location")
+    ap.add_argument("--no-cache", action="store_true", help="always decode and parse from scratch")
+    ap.add_argument("-f", "--format", dest="formats", action="append", choices=list(EXPORT_FORMATS),
+                    help="output format; repeat for several (default: xlsx)")
+    ap.add_argument("--integer-cents", action="store_true",
+                    help="carry amounts as exact int64 cents through parsing and aggregation")
+    ap.add_argument("--header-chars", type=_non_negative_int, default=HEADER_REGION_CHARS, metavar="N",
+                    help="characters from the start/end of the document searched for account header and "
+                         f"summary (default: {HEADER_REGION_CHARS}; 0 = whole text)")
+    ap.add_argument("-v", "--verbose", action="store_true",
+                    help="log per-file parse metrics (stage timings, line and partner-rule counts)")
+    ap.add_argument("--profile", metavar="DIR",
+                    help="record a cProfile dump and tracemalloc snapshot per PDF into DIR, named by "
+                         "the PDF's SHA-256 (bypasses the cache; slow, use for a few documents)")
+    ap.add_argument("--log-json", action="store_true", help="emit log records as one JSON object per line")
+    return ap
+
+def main(argv=None) -> int:
+    args = build_arg_parser().parse_args(argv)
+    log_level = logging.INFO if args.verbose else logging.WARNING
+    configure_logging(log_level, args.log_json)
+    pdfs = collect_pdfs(args.inputs)
+    if not pdfs:
+        print("No PDF files found.", file=sys.stderr)
+        return 1
+
+    out_dir = Path(args.output_dir)
+    cache_dir = None if args.no_cache else args.cache_dir
+
+    pdf_workers = args.pdf_workers or default_pdf_workers(args.jobs, len(pdfs))
+
+    start = time.perf_counter()
+    rows = run_batch(pdfs, out_dir, args.jobs, cache_dir, integer_cents=args.integer_cents,
+                     formats=list(dict.fromkeys(args.formats or ["xlsx"])), log_level=log_level,
+                     json_logs=args.log_json, profile_dir=args.profile, header_chars=args.header_chars,
+                     pdf_workers=pdf_workers)
+    elapsed = time.perf_counter() - start
+
+    summary_path = out_dir / "run_summary.csv"
+    write_summary(rows, summary_path)
+
+    n_err = sum(1 for r in rows if r["status"] == "error")
+    n_rows = sum(r["rows"] for r in rows)
+    print(f"Processed {len(rows)} file(s), {n_rows} transaction rows, {n_err} error(s) "
+          f"in {elapsed:.1f}s. Summary: {summary_path}")
+    return 1 if n_err else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
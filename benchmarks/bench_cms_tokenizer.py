@@ -0,0 +1,91 @@
+# benchmarks/bench_cms_tokenizer.py
+"""Rows/second extract_cms_transactions + DataFrame: tokenizer lama (per-token re.match,
+list of dict) vs CMS_ROW dengan buffer per kolom.
+
+    python benchmarks/bench_cms_tokenizer.py --rows 50000
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.synthetic import cms_lines
+from bri_parser import clean_amount, extract_cms_transactions, transactions_frame
+
+def legacy_extract_cms_transactions(text):
+    """Implementasi sebelum CMS_ROW, disimpan sebagai pembanding."""
+    transactions = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        if re.match(r'^\d{2}/\d{2}/\d{2}\s+\d{2}:\d{2}:\d{2}', line):
+            try:
+                parts = line.split()
+                if len(parts) >= 6:
+                    numeric_parts = []
+                    for i in range(len(parts) - 1, -1, -1):
+                        p = parts[i]
+                        if re.match(r'^[\d,\.]+$', p) or re.match(r'^\d{7}$', p) or p in ['CMSPYRL','BRI0372','BRIMDBT']:
+                            numeric_parts.insert(0, p)
+                            if len(numeric_parts) == 4:
+                                break
+                    if len(numeric_parts) >= 4:
+                        debet_str, credit_str, ledger_str, teller_id = numeric_parts[0], numeric_parts[1], numeric_parts[2], numeric_parts[3]
+                        debet  = clean_amount(debet_str) if debet_str != '0.00' else 0.0
+                        credit = clean_amount(credit_str) if credit_str != '0.00' else 0.0
+                        ledger = clean_amount(ledger_str)
+                        start_idx = 2
+                        end_idx   = len(parts) - 4
+                        remark = ' '.join(parts[start_idx:end_idx]).strip() if end_idx > start_idx else ""
+                        transactions.append({
+                            'Date': parts[0],
+                            'Remark': remark,
+                            'Debit': debet,
+                            'Credit': credit,
+                            'Saldo': ledger
+                        })
+            except:
+                continue
+    return transactions
+
+def best_of(fn, arg, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(arg)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=50_000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    # Sisipkan baris non-transaksi seperti header halaman agar mirip dokumen asli
+    lines = []
+    for i, line in enumerate(cms_lines(args.rows)):
+        if i % 40 == 0:
+            lines += ["", "Date Time Remark Debet Credit Ledger Teller ID"]
+        lines.append(line)
+    text = "\n".join(lines)
+
+    t_old, old = best_of(lambda t: pd.DataFrame(legacy_extract_cms_transactions(t)), text, args.repeat)
+    t_new, new = best_of(lambda t: transactions_frame(extract_cms_transactions(t)), text, args.repeat)
+    if not old.equals(new):
+        print("MISMATCH: legacy and current tokenizer disagree", file=sys.stderr)
+        return 1
+
+    print(f"rows: {len(new)}")
+    print(f"legacy : {t_old:8.3f}s  {len(old) / t_old:12,.0f} rows/s")
+    print(f"CMS_ROW: {t_new:8.3f}s  {len(new) / t_new:12,.0f} rows/s  ({t_old / t_new:.1f}x)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+# benchmarks/bench_format_dispatch.py
+"""Registry format (sniff per format + fallback header/ringkasan) vs dispatch if/else lama.
+
+Dokumen sintetis kedua layout plus turunannya (halaman pertama kosong, header
+dibuang, ringkasan dibuang, penanda kedua format sekaligus, hanya baris transaksi)
+diparse dengan beberapa nama file dan header_chars. Format terdeteksi, header dan
+ringkasan harus sama dengan dispatch lama; keluar dengan status 1 kalau tidak.
+
+    python benchmarks/bench_format_dispatch.py
+"""
+import argparse
+import re
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import bri_parser as bp
+from benchmarks.synthetic import COLUMN_HEADERS, LAYOUTS, statement_pages
+
+# ============== Implementasi lama (pembanding) ==============
+
+def legacy_sniff_format(first_page_text):
+    """sniff_format sebelum registry, disimpan sebagai pembanding."""
+    if not first_page_text:
+        return None
+    cms_score = sum(1 for p in bp.CMS_MARKERS if p.search(first_page_text))
+    est_score = sum(1 for p in bp.E_STATEMENT_MARKERS if p.search(first_page_text))
+
+    for line in first_page_text.split('\n'):
+        line = line.strip()
+        if not bp.ROW_START.match(line):
+            continue
+        last = line.rsplit(None, 1)[-1]
+        if re.fullmatch(r'\d{7}', last) or last in bp.CMS_TELLER_IDS:
+            cms_score += 1
+        else:
+            est_score += 1
+        break
+
+    if cms_score > est_score:
+        return "CMS"
+    if est_score > cms_score:
+        return "E_STATEMENT"
+    return None
+
+def legacy_header_and_summary(pages, filename, header_chars=bp.HEADER_REGION_CHARS):
+    """Bagian header/ringkasan parse_bri_pages sebelum registry."""
+    fmt = legacy_sniff_format(bp.first_page_text(pages)) or bp.detect_format_by_filename(filename)
+    region = bp.header_region(pages, header_chars) if header_chars else bp.join_pages(pages)
+    if fmt == "CMS":
+        personal_info = bp.extract_cms_account_info(region)
+        if header_chars and bp._missing_fields(personal_info, bp.CMS_REQUIRED_FIELDS):
+            personal_info = bp.extract_cms_account_info(bp.join_pages(pages))
+        summary_info = bp.extract_cms_summary(region)
+        if header_chars and not summary_info:
+            summary_info = bp.extract_cms_summary(bp.join_pages(pages))
+    else:
+        personal_info, summary_info = bp.extract_personal_info(region)
+        if header_chars and (bp._missing_fields(personal_info, bp.E_STATEMENT_REQUIRED_FIELDS) or not summary_info):
+            personal_info, summary_info = bp.extract_personal_info(bp.join_pages(pages))
+    personal_df = pd.DataFrame([personal_info])
+    personal_df["Detected Format"] = fmt
+    return fmt, personal_df, pd.DataFrame([summary_info])
+
+# ============== Fixture ==============
+
+FILENAMES = ["cms_2024.pdf", "rekening_2025.pdf", "statement.pdf"]
+HEADER_CHARS = [bp.HEADER_REGION_CHARS, 64, None]
+
+def _drop(lines, prefixes):
+    return [line for line in lines if not line.startswith(prefixes)]
+
+def fixtures():
+    """(nama, halaman) untuk setiap layout dan turunannya."""
+    other = {"cms": "estatement", "estatement": "cms"}
+    for layout in LAYOUTS:
+        for n_pages in (1, 3):
+            pages = statement_pages(layout, n_pages, rows_per_page=20)
+            first, rest = pages[0], pages[1:]
+            header_end = first.index(COLUMN_HEADERS[layout])
+            variants = {
+                "as-is": pages,
+                "blank-first-page": [[]] + pages,
+                "no-header": [first[header_end:]] + rest,
+                "no-summary": [_drop(p, ("OPENING", "Saldo", "Opening", "Total", "Closing")) for p in pages],
+                "both-headers": [statement_pages(other[layout], 1)[0][:header_end] + first] + rest,
+                "rows-only": [_drop(p, tuple("ABCDEFGHIJKLMNOPQRSTUVWXYZ")) for p in pages],
+            }
+            for name, variant in variants.items():
+                yield f"{layout}/{n_pages}p/{name}", ["\n".join(lines) for lines in variant]
+    yield "empty", []
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--show", type=int, default=3, help="print up to N differing cases")
+    args = ap.parse_args(argv)
+
+    cases = diffs = 0
+    for name, pages in fixtures():
+        for filename in FILENAMES:
+            for header_chars in HEADER_CHARS:
+                cases += 1
+                fmt, personal_df, summary_df = legacy_header_and_summary(pages, filename, header_chars)
+                result = bp.parse_bri_pages(pages, filename, header_chars)
+                same = (result.metrics["format"] == fmt and personal_df.equals(result[0])
+                        and summary_df.equals(result[1]))
+                if not same:
+                    diffs += 1
+                    if diffs <= args.show:
+                        print(f"  {name} {filename} header_chars={header_chars}: legacy {fmt}, "
+                              f"now {result.metrics['format']}\n{personal_df.T}\n{result[0].T}")
+    print(f"{cases} cases, {diffs} differ from the legacy dispatch")
+    return 1 if diffs else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
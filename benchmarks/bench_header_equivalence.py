@@ -0,0 +1,484 @@
+# benchmarks/bench_header_equivalence.py
+"""Pola header/ringkasan/baris CMS yang ditulis ulang (linear-time) vs implementasi lama.
+
+Setiap varian layout header (spasi, baris baru, titik dua, baris alamat tambahan, ...)
+dijalankan lewat extractor lama dan yang sekarang; keluar dengan status 1 kalau ada
+satu field yang berbeda. Waktu total kedua implementasi ikut dicetak.
+
+    python benchmarks/bench_header_equivalence.py
+    python benchmarks/bench_header_equivalence.py --show 5
+"""
+import argparse
+import itertools
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import bri_parser as bp
+from bri_parser import clean_amount
+
+# ============== Implementasi lama (pembanding) ==============
+
+LEGACY_CMS_ROW = re.compile(
+    r'(\d{2}/\d{2}/\d{2})\s+(\d{2}:\d{2}:\d{2})\s+(?:(.*?)\s+)??'
+    + r'\s+'.join([r'([\d,\.]+|CMSPYRL|BRI0372|BRIMDBT)'] * 4) + r'$'
+)
+
+def legacy_extract_cms_account_info(text):
+    """Implementasi sebelum pola ter-compile, disimpan sebagai pembanding."""
+    account_info = {
+        "Bank": "BRI",
+        "Account Name": None,
+        "Account Number": None,
+        "Start Period": None,
+        "End Period": None,
+    }
+
+    # Account No
+    account_patterns = [
+        r'Account\s+No\s*:?\s*(\d{4}-\d{2}-\d{6}-\d{2}-\d)',
+        r'Account\s+No\s*:?\s*(\d+)',
+        r'Account\s+No\s*\n*\s*:?\s*(\d{4}-\d{2}-\d{6}-\d{2}-\d)',
+        r'Account\s+No\s*\n*\s*(\d+)',
+    ]
+    for p in account_patterns:
+        m = re.search(p, text, re.IGNORECASE | re.DOTALL)
+        if m:
+            account_info["Account Number"] = m.group(1).strip()
+            break
+
+    # Account Name
+    name_patterns = [
+        r'Account\s+Name\s*:?\s*([A-Z][A-Z\s&\.]+?)(?=\s*Today\s*Hold|\s*Period|\s*Account\s*Status)',
+        r'Account\s+Name\s*\n*\s*:?\s*([A-Z][A-Z\s&\.]+?)(?=\s*Today|\s*Period|\s*Account\s*Status)',
+        r'Account\s+Name\s+([A-Z][A-Z\s&\.]+?)(?=\s*Today|\s*Period|\s*Account\s*Status)',
+        r'Account\s+Name\s*:?\s*(PT\s+[A-Z\s]+)',
+        r'Account\s+Name\s*:?\s*([A-Z][A-Z\s&\.PT]+)',
+        r'Account\s+Name\s*:?\s*([A-Z\s&\.PT]+?)(?=\s*\n|\s*Today|\s*Period|\s*Account)',
+    ]
+    for p in name_patterns:
+        m = re.search(p, text, re.IGNORECASE | re.DOTALL)
+        if m:
+            account_info["Account Name"] = m.group(1).strip()
+            break
+
+    # Period
+    period_patterns = [
+        r'Period\s*:?\s*(\d{2}/\d{2}/\d{4})\s*-\s*(\d{2}/\d{2}/\d{4})',
+        r'Period\s*\n*\s*:?\s*(\d{2}/\d{2}/\d{4})\s*-\s*(\d{2}/\d{2}/\d{4})',
+    ]
+    for p in period_patterns:
+        m = re.search(p, text, re.IGNORECASE | re.DOTALL)
+        if m:
+            account_info['Start Period'] = m.group(1)
+            account_info['End Period'] = m.group(2)
+            break
+
+    # Fallback berbasis baris
+    if not account_info.get("Account Name") or not account_info.get("Account Number"):
+        lines = text.split('\n')
+        for i, line in enumerate(lines):
+            s = line.strip()
+            if 'Account No' in s and ':' in s:
+                parts = s.split(':', 1)
+                account_info['Account Number'] = parts[1].strip()
+            elif 'Account Name' in s and ':' in s:
+                parts = s.split(':', 1)
+                account_info['Account Name'] = parts[1].strip()
+            elif 'Period' in s and ':' in s:
+                parts = s.split(':', 1)
+                m = re.search(r'(\d{2}/\d{2}/\d{4})\s*-\s*(\d{2}/\d{2}/\d{4})', parts[1])
+                if m:
+                    account_info['Start Period'] = m.group(1)
+                    account_info['End Period'] = m.group(2)
+    return account_info
+
+def legacy_extract_cms_summary(text):
+    summary = {}
+    pat = re.compile(
+        r'OPENING\s+BALANCE\s+TOTAL\s+DEBET\s+TOTAL\s+CREDIT\s+CLOSING\s+BALANCE\s*\n'
+        r'\s*([\d,\.]+)\s+([\d,\.]+)\s+([\d,\.]+)\s+([\d,\.]+)',
+        re.IGNORECASE | re.MULTILINE
+    )
+    m = pat.search(text)
+    if m:
+        try:
+            summary['Saldo Awal']     = clean_amount(m.group(1))
+            summary['Mutasi Debit']   = clean_amount(m.group(2))
+            summary['Mutasi Credit']  = clean_amount(m.group(3))
+            summary['Saldo Akhir']    = clean_amount(m.group(4))
+        except:
+            pass
+    return summary
+
+def legacy_extract_personal_info(text):
+    personal_info = {
+        "Bank": "BRI",
+        "Account Name": None,
+        "Account Number": None,
+        "Address": None,
+        "Report Date": None,
+        "Branch": None,
+        "Business Unit Address": None,
+        "Product Name": None,
+        "Currency": None,
+        "Period": None,
+        "Start Period": None,
+        "End Period": None
+    }
+
+    nama_patterns = [
+        r'(?:Kepada\s+Yth\.\s*/\s*To\s*:\s*\n\s*[A-Z][A-Z\s]*?\n)\s*(.*?)(?=\n\n|\nNo\.\s*Rekening|\nTanggal\s+Laporan|\nPeriode\s+Transaksi|\nNo\s+Rekening)',
+        r'Kepada\s+Yth\.\s*/\s*To\s*:\s*\n\s*([^\n]+)(?:\n([^\n]*?))*?(?=\n\s*No\.\s*Rekening|\n\s*Tanggal\s+Laporan|\n\s*Account\s+No)',
+        r'Kepada\s+Yth\.\s*/\s*To\s*:\s*\n\s*(.+?)(?=\n\s*No\.\s*Rekening)',
+    ]
+    
+    for pattern in nama_patterns:
+        nama_match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
+        if nama_match:
+            extracted_text = nama_match.group(1).strip()
+            lines = [line.strip() for line in extracted_text.split('\n') if line.strip()]
+
+            if lines:
+                # personal_info['Account Name'] = lines[0]
+                nama_clean = lines[0]
+                nama_clean = re.sub(r'\s+Periode\s+Transaksi.*', '', nama_clean, flags=re.IGNORECASE).strip()
+                personal_info['Account Name'] = nama_clean
+
+                if len(lines) > 1:
+                    alamat_lines = lines[1:]
+                    alamat_filtered = []
+                    for line in alamat_lines:
+                      if not re.match(r'\d{2}/\d{2}/\d{2,4}', line) and 'Periode Transaksi' not in line:
+                        alamat_filtered.append(line)
+                    if alamat_filtered:
+                      alamat_valid = []
+                      for line in alamat_filtered:
+                        if 'Transaction Period' not in line:
+                          alamat_valid.append(line)
+    
+                      if alamat_valid:
+                          alamat_cleaned = ' '.join(alamat_valid)
+                          alamat_cleaned = re.sub(r'\s+', ' ', alamat_cleaned)
+                          personal_info['Address'] = alamat_cleaned
+            break
+
+    if 'Account Name' not in personal_info:
+        simple_nama_pattern = r'Kepada\s+Yth\.\s*/\s*To\s*:\s*\n\s*([A-Z][A-Z\s]+)'
+        simple_match = re.search(simple_nama_pattern, text, re.IGNORECASE)
+        if simple_match:
+            personal_info['nama'] = simple_match.group(1).strip()
+
+    tanggal_patterns = [
+        r'Tanggal\s+Laporan\s*[:\s]*(\d{2}/\d{2}/\d{2,4})',
+        r'Statement\s+Date\s*[:\s]*(\d{2}/\d{2}/\d{2,4})',
+    ]
+    # Tanggal laporan
+    for pattern in tanggal_patterns:
+        tanggal_match = re.search(pattern, text, re.IGNORECASE)
+        if tanggal_match:
+            personal_info['Report Date'] = tanggal_match.group(1)
+            break
+
+    # Ekstrak periode transaksi dengan error handling
+    periode_patterns = [
+        r'Periode\s+Transaksi\s*[:\s]*(\d{2}/\d{2}/\d{2,4})\s*-\s*(\d{2}/\d{2}/\d{2,4})',
+        r'Transaction\s+Period\s*[:\s]*(\d{2}/\d{2}/\d{2,4})\s*-\s*(\d{2}/\d{2}/\d{2,4})',
+    ]
+    for pattern in periode_patterns:
+        periode_match = re.search(pattern, text, re.IGNORECASE)
+        if periode_match:
+            personal_info['Start Period'] = periode_match.group(1)
+            personal_info['End Period'] = periode_match.group(2)
+            break
+
+    # Ekstrak nomor rekening dengan error handling
+    rekening_patterns = [
+        r'No\.\s*Rekening\s*\n*Account\s*No\s*[,:]*\s*(\d+)',
+        r'No\.\s*Rekening\s*[:\s]*(\d+)',
+        r'Account\s*No\s*[:\s]*(\d+)',
+    ]
+    for pattern in rekening_patterns:
+        rekening_match = re.search(pattern, text, re.IGNORECASE)
+        if rekening_match:
+            personal_info['Account Number'] = rekening_match.group(1)
+            break
+
+    # Ekstrak nama produk dengan error handling
+    produk_patterns = [
+        r'(?:Nama\s+Produk|Product\s+Name)\s*[,:]*\s*(.*?)(?=\s*(?:Unit\s*Kerja|Business\s*Unit|Valuta|Currency|Alamat\s*Unit\s*Kerja|\n|$))',
+    ]
+    for pattern in produk_patterns:
+        produk_match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+        if produk_match:
+            personal_info['Product Name'] = produk_match.group(1).strip()
+            break
+
+    # Ekstrak valuta dengan error handling
+    valuta_patterns = [
+        r'Valuta\s*\n*Currency\s*[,:]*\s*([A-Z]+)',
+        r'Valuta\s*[:\s]*([A-Z]+)',
+        r'Currency\s*[:\s]*([A-Z]+)',
+    ]
+    for pattern in valuta_patterns:
+        valuta_match = re.search(pattern, text, re.IGNORECASE)
+        if valuta_match:
+            personal_info['Currency'] = valuta_match.group(1).strip()
+            break
+
+    # Ekstrak unit kerja dengan error handling
+    unit_patterns = [
+        r'Unit\s+Kerja\s*\n*Business\s+Unit\s*[,:]*\s*([A-Z][A-Z\s]*?)(?=\s*(?:Alamat\s+Unit|Business\s+Unit\s+Address|\n|$))',
+        r'Unit\s+Kerja\s*[:\s]*([A-Z][A-Z\s]*?)(?=\s*(?:Alamat\s+Unit|Business\s+Unit\s+Address|\n|$))',
+        r'Business\s+Unit\s*[:\s]*([A-Z][A-Z\s]*?)(?=\s*(?:Alamat\s+Unit|Business\s+Unit\s+Address|\n|$))',
+    ]
+    for pattern in unit_patterns:
+        unit_match = re.search(pattern, text, re.IGNORECASE)
+        if unit_match:
+            personal_info['Branch'] = unit_match.group(1).strip()
+            break
+
+    # Ekstrak alamat unit kerja dengan error handling
+    alamat_unit_kerja_patterns = [
+        r'(?:Alamat\s+Unit\s+Kerja|Business\s+Unit\s+Address)\s*[,:]*\s*\n\s*([A-Z][A-Z\s]*?)\n\s*([A-Z][A-Z\s]*?)(?=\n|$)',
+        r'(?:Alamat\s+Unit\s+Kerja|Business\s+Unit\s+Address)\s*[,:]*\s*([A-Z][A-Z\s]*?)\n\s*([A-Z][A-Z\s]*?)(?=\n|$)',
+        r'(?:Alamat\s+Unit\s+Kerja|Business\s+Unit\s+Address)\s*[,:]*\s*([A-Z][A-Z\s]*?)(?=\n|$)',
+    ]
+
+    for pattern in alamat_unit_kerja_patterns:
+        alamat_unit_match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+        if alamat_unit_match:
+            if len(alamat_unit_match.groups()) >= 2:
+                alamat_temp = f"{alamat_unit_match.group(1).strip()} {alamat_unit_match.group(2).strip()}"
+            else:
+                alamat_temp = alamat_unit_match.group(1).strip()
+
+            alamat_temp = re.sub(r'Product\s+Name\s*Business\s+Unit\s*Address ', '', alamat_temp, flags=re.IGNORECASE).strip()
+            personal_info['Business Unit Address'] = alamat_temp
+            break
+
+    # --- Ekstraksi Informasi Finansial (Saldo) dengan error handling ---
+    financial_summary = {}
+
+    try:
+        balance_summary_pattern = re.compile(
+            r'(?:Saldo Awal|Opening Balance)\s*\n?'
+            r'(?:Opening Balance)?\s*\n?'
+            r'(?:Total Transaksi Debet|Total Debit Transaction)\s*\n?'
+            r'(?:Total Debit Transaction)?\s*\n?'
+            r'(?:Total Transaksi Kredit|Total Credit Transaction)\s*\n?'
+            r'(?:Total Credit Transaction)?\s*\n?'
+            r'(?:Saldo Akhir|Closing Balance)\s*\n?'
+            r'(?:Closing Balance)?\s*\n?'
+            r'([\d,\.]+\s+[\d,\.]+\s+[\d,\.]+\s+[\d,\.]+)',
+            re.IGNORECASE | re.DOTALL
+        )
+
+        financial_match = balance_summary_pattern.search(text)
+        if financial_match:
+            amounts_line = financial_match.group(1).strip()
+            amounts = amounts_line.split()
+
+            def parse_amount(amount_str):
+                try:
+                    amount_str = amount_str.strip()
+                    if ',' in amount_str and amount_str.rfind(',') > amount_str.rfind('.'):
+                        amount_str = amount_str.replace('.', '')
+                        amount_str = amount_str.replace(',', '.')
+                    elif ',' in amount_str:
+                        amount_str = amount_str.replace(',', '')
+                    elif amount_str.count('.') > 1:
+                        parts = amount_str.rsplit('.', 1)
+                        integer_part = parts[0].replace('.', '')
+                        if len(parts) > 1:
+                            decimal_part = parts[1]
+                            amount_str = f"{integer_part}.{decimal_part}"
+                        else:
+                            amount_str = integer_part
+                    return float(amount_str)
+                except:
+                    return 0.0
+
+            if len(amounts) >= 4:
+                financial_summary['opening_balance'] = parse_amount(amounts[0])
+                financial_summary['total_debit_transaction'] = parse_amount(amounts[1])
+                financial_summary['total_credit_transaction'] = parse_amount(amounts[2])
+                financial_summary['closing_balance'] = parse_amount(amounts[3])
+
+    except Exception:
+        pass
+
+    return personal_info, financial_summary
+
+# ============== Varian layout ==============
+
+ESTATEMENT_TEMPLATE = """Kepada Yth. / To :{c}
+{ws}BUDI SANTOSO
+{ws}JL MERDEKA NO 1{extra}
+{blank}No. Rekening{sep}Account No {col} 001201000123456
+Tanggal Laporan{tcol} 15/01/2025
+Periode Transaksi : 01/01/2025 - 31/01/2025
+Nama Produk{col} BRITAMA  IDR Valuta{sep}Currency{col}IDR
+Unit Kerja{sep}Business Unit{col} KCP JAKARTA  SUDIRMAN
+Alamat Unit Kerja{col}{nl} JL SUDIRMAN KAV 1
+ JAKARTA PUSAT
+Saldo Awal{sep}Opening Balance
+Total Transaksi Debet{sep}Total Debit Transaction
+Total Transaksi Kredit Total Credit Transaction
+Saldo Akhir{sep}Closing Balance
+1,000.00  2,000.00 3,500.00
+2,500.00
+"""
+
+CMS_TEMPLATE = """PT. BANK RAKYAT INDONESIA (PERSERO) Tbk.
+ACCOUNT STATEMENT
+Account No{col}{number}
+Account Name{col}{name}{after_name}
+Period{col}01/01/2024{dash}31/12/2024
+OPENING BALANCE TOTAL DEBET TOTAL CREDIT CLOSING BALANCE{trail}
+{ws}1,000,000.00 250,000.00 500,000.00 1,250,000.00
+"""
+
+CMS_ROW_LINES = [
+    "01/01/24 10:00:00 NBMB BUDI SANTOSO TO ANI 1,000.00 0.00 2,000.00 8888999",
+    "01/01/24 10:00:00 1,000.00 0.00 2,000.00 CMSPYRL",
+    "01/01/24 10:00:00  1,000.00 0.00 2,000.00 CMSPYRL",
+    "01/01/24 10:00:00 TRF  KE   RUDI 12 1,000.00 0.00 2,000.00 BRIMDBT",
+    "01/01/24 10:00:00 TRF\tKE RUDI 1,000.00 0.00 2,000.00 0372001",
+    "01/01/24 10:00:00   PAYROLL 1,000.00 0.00 2,000.00 BRI0372",
+    "01/01/24 10:00:00 A 1 2 3 4 5",
+    "01/01/24 10:00:00 1 2 3 4 5",
+    "01/01/24 10:00:00 1 2 3 4",
+    "01/01/24 10:00:00 QRIS 1,0.0 0.00 2.000,00 CMSPYRL trailing",
+]
+
+def estatement_variants():
+    for c, ws, extra, blank, sep, col, tcol, nl in itertools.product(
+            ["", "  "], ["", "  "], ["", "\nRT 01 RW 02", "\n\n"], ["", "\n"], [" ", "\n"],
+            [":", "", " ,"], [":", ""], ["", "\n", "  \n  "]):
+        yield ESTATEMENT_TEMPLATE.format(c=c, ws=ws, extra=extra, blank=blank, sep=sep, col=col,
+                                         tcol=tcol, nl=nl)
+
+# Label Inggris / baris yang hilang, diterapkan sendiri-sendiri dan berpasangan ke layout dasar
+ESTATEMENT_EDITS = [
+    ("Tanggal Laporan", "Statement Date"),
+    ("Periode Transaksi", "Transaction Period"),
+    ("No. Rekening", "No Rekening"),
+    ("No. Rekening\nAccount No", "Account No"),
+    ("Nama Produk", "Product Name"),
+    ("Unit Kerja\nBusiness Unit", "Business Unit"),
+    ("Alamat Unit Kerja", "Business Unit Address"),
+    ("Valuta\nCurrency", "Currency"),
+    ("Kepada Yth. / To :\n", ""),
+    ("BUDI SANTOSO\n", "NASABAH YTH\nBUDI SANTOSO\n"),
+    ("JL MERDEKA NO 1", "JL MERDEKA NO 1 Periode Transaksi"),
+    ("Periode Transaksi : 01/01/2025 - 31/01/2025\n", ""),
+    (" JAKARTA PUSAT\n", ""),
+    ("1,000.00  2,000.00 3,500.00\n2,500.00", "1.000,00 2.000,00 3.500,00 2.500,00"),
+    ("1,000.00  2,000.00 3,500.00\n2,500.00", "1.000.000.00 2 3 4"),
+    ("Saldo Awal", "Opening Balance"),
+    # Baris kosong / hanya spasi setelah sapaan dan nama: pola nama lama bisa menghasilkan capture kosong
+    ("Kepada Yth. / To :\n", "Kepada Yth. / To :\n\n"),
+    ("BUDI SANTOSO\n", "BUDI SANTOSO\n\n"),
+    ("BUDI SANTOSO\n", "BUDI SANTOSO\n   \n"),
+    ("JL MERDEKA NO 1\n", "JL MERDEKA NO 1\n\n"),
+    ("JL MERDEKA NO 1\n", "JL MERDEKA NO 1\n \t\n"),
+    ("\nNo. Rekening", "\n\nNo. Rekening"),
+]
+
+def estatement_edit_variants():
+    base = ESTATEMENT_TEMPLATE.format(c="", ws="", extra="", blank="", sep="\n", col=" :", tcol=" :", nl="\n")
+    for n in (1, 2):
+        for edits in itertools.combinations(ESTATEMENT_EDITS, n):
+            text = base
+            for old, new in edits:
+                text = text.replace(old, new)
+            yield text
+
+# Baris acak untuk blok sapaan; mencakup kasus capture kosong pola nama lama
+BLOCK_LINES = [
+    "Kepada Yth. / To :", "Kepada Yth. / To :  ", "Kepada Yth./To:", "", "", "  ", "\t", "BUDI SANTOSO",
+    "NASABAH YTH", "JL MERDEKA NO 1", "budi", "A", "  CV X & Y.", "x 1", "No. Rekening : 123",
+    "No.Rekening 1", "No Rekening 9", "Tanggal Laporan : 15/01/2025",
+    "Periode Transaksi : 01/01/2025 - 31/01/2025", "Periode  Transaksi 1", "PERIODE TRANSAKSI",
+    "Account No : 55", "Account  No 7", "Opening Balance", "Saldo Awal",
+]
+BLOCK_FUZZ_CASES = 20_000
+
+def estatement_block_fuzz(seed: int = 0):
+    yield "Kepada Yth. / To :\nBUDI SANTOSO\n\nNo. Rekening : 123\n"
+    rng = random.Random(seed)
+    for _ in range(BLOCK_FUZZ_CASES):
+        lines = [rng.choice(["", " ", "  ", "\t"]) + rng.choice(BLOCK_LINES) for _ in range(rng.randint(2, 9))]
+        yield "\n".join(lines) + rng.choice(["", "\n"])
+
+def cms_variants():
+    for col, number, name, after_name, dash, trail, ws in itertools.product(
+            [" : ", ":", " ", "\n: ", " \n "], ["0123-01-000123-30-1", "012301000123301"],
+            ["PT MAJU JAYA ABADI", "CV A & B. SEJAHTERA", "budi  santoso"],
+            [" Today Hold : 0.00", "", "\nAccount Status : AKTIF", " Period"],
+            [" - ", "-"], ["", "  ", "\n"], ["", "  "]):
+        yield CMS_TEMPLATE.format(col=col, number=number, name=name, after_name=after_name, dash=dash,
+                                  trail=trail, ws=ws)
+
+def cms_row_variants():
+    for line in CMS_ROW_LINES:
+        yield line
+        yield line.replace(" ", "  ")
+        yield line + " "
+
+def _cms_row(pattern, line):
+    m = pattern.match(line.strip())
+    if m is None:
+        return None
+    groups = list(m.groups())
+    groups[2] = bp._squash_spaces(groups[2]) if groups[2] else ""
+    return groups
+
+CHECKS = {
+    "e-statement header+summary": (estatement_variants, legacy_extract_personal_info, bp.extract_personal_info),
+    "e-statement label edits": (estatement_edit_variants, legacy_extract_personal_info,
+                                bp.extract_personal_info),
+    "e-statement block fuzz": (estatement_block_fuzz, legacy_extract_personal_info, bp.extract_personal_info),
+    "CMS account info": (cms_variants, legacy_extract_cms_account_info, bp.extract_cms_account_info),
+    "CMS summary": (cms_variants, legacy_extract_cms_summary, bp.extract_cms_summary),
+    "CMS row": (cms_row_variants, lambda line: _cms_row(LEGACY_CMS_ROW, line),
+                lambda line: _cms_row(bp.CMS_ROW, line)),
+}
+
+def run_check(variants, legacy, current, show: int):
+    cases = list(variants())
+    start = time.perf_counter()
+    old = [legacy(t) for t in cases]
+    t_old = time.perf_counter() - start
+    start = time.perf_counter()
+    new = [current(t) for t in cases]
+    t_new = time.perf_counter() - start
+
+    diffs = [(t, a, b) for t, a, b in zip(cases, old, new) if a != b]
+    for t, a, b in diffs[:show]:
+        print(f"  input : {t!r}\n  legacy: {a}\n  now   : {b}")
+    return len(cases), len(diffs), t_old, t_new
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--show", type=int, default=3, help="print up to N differing inputs per check")
+    args = ap.parse_args(argv)
+
+    failed = 0
+    for name, (variants, legacy, current) in CHECKS.items():
+        n, n_diff, t_old, t_new = run_check(variants, legacy, current, args.show)
+        status = "ok" if not n_diff else f"MISMATCH ({n_diff})"
+        print(f"{name:<28} {n:5d} variants  legacy {t_old:7.3f}s  now {t_new:7.3f}s  {status}")
+        failed += bool(n_diff)
+    if failed:
+        print(f"{failed} check(s) disagree with the legacy implementation", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
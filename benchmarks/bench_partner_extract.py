@@ -0,0 +1,184 @@
+# benchmarks/bench_partner_extract.py
+"""_match_partner_rule: skip keyword per-kata + upper() berulang (lama) vs satu regex skip + upper() sekali.
+
+Fuzz deskripsi acak dari potongan kata kunci/aturan (default 300.000) dan
+deskripsi realistis; hasil (nama partner, aturan) harus sama persis. Keluar
+dengan status 1 kalau ada yang berbeda; waktu per deskripsi ikut dicetak.
+
+    python benchmarks/bench_partner_extract.py --fuzz 300000
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import bri_parser as bp
+from benchmarks.synthetic import DESCRIPTIONS
+
+def legacy_match_partner_rule(description):
+    """_match_partner_rule sebelum scan skip keyword tunggal, disimpan sebagai pembanding."""
+    if not description or (isinstance(description, float) and pd.isna(description)):
+        return None, "empty"
+
+    skip_keywords = [
+        "BIAYA", "ADM", "BUNGA", "PAJAK", "KLIRING", "TARIK TUNAI",
+        "SETORAN", "BI-FAST", "BPJS", "TAX", "INTEREST",
+        "FEE", "SINGLE CN", "POLLING", "REWARD", "CLAIM", "BPJS TK", "BPJS KESEHATAN"
+    ]
+    if any(k in str(description).upper() for k in skip_keywords):
+        return None, "skip_keyword"
+
+    cleaned = str(description).strip()
+
+    # Pola umum TRF/TRANSFER KE/TO
+    m = re.search(r'(?:TRF|TRANSFER)\s+(?:KE|TO)\s+([A-Z\s\.\-&]{3,})', cleaned.upper())
+    if m:
+        name = re.sub(r'\s{2,}', ' ', m.group(1).title().strip())
+        if len(name) >= 3:
+            return name, "transfer"
+
+    # BM
+    if re.search(r'BM\d+', cleaned):
+        lines = [ln.strip() for ln in cleaned.split('\n') if ln.strip()]
+        words = []
+        esb_found = False
+        for ln in lines:
+            if ln.startswith('ESB:'):
+                esb_found = True
+                continue
+            if re.match(r'^BM\d+\s+\d+\s+\d+', ln):
+                mm = re.search(r'BM\d+\s+\d+\s+\d+\s+(.+)', ln)
+                if mm:
+                    words += [w for w in mm.group(1).split() if w.isalpha() and len(w) >= 2]
+            else:
+                if not esb_found:
+                    words += [w for w in ln.split() if w.isalpha() and len(w) >= 2]
+        if words:
+            return ' '.join(words), "bm"
+
+    # NBMB
+    if "NBMB" in cleaned.upper():
+        mm = re.search(r'NBMB\s+(.*?)\s+TO\s+(.*?)(?:\n|ESB:|$)', cleaned, re.IGNORECASE | re.DOTALL)
+        if mm:
+            receiver = mm.group(2).strip()
+            sender   = mm.group(1).strip()
+            return (receiver if receiver else sender), "nbmb"
+
+    # WBNKTRF
+    if "WBNKTRF" in cleaned.upper():
+        after = re.sub(r'WBNKTRF\w+', '', cleaned, flags=re.IGNORECASE)
+        after = re.sub(r'ESB:.*', '', after, flags=re.DOTALL)
+        words = [w for w in after.split() if w.isalpha() and len(w) >= 2]
+        if words:
+            return ' '.join(words), "wbnktrf"
+
+    # BFST
+    if "BFST" in cleaned.upper():
+        cnt = re.sub(r'BFST\d+', '', cleaned, flags=re.IGNORECASE)
+        cnt = re.sub(r'ESB:.*', '', cnt, flags=re.DOTALL)
+        cnt = re.sub(r'\d{8,}', '', cnt)
+        if ':' in cnt:
+            for part in cnt.split(':'):
+                nm = ''.join(c for c in part if c.isalpha() or c.isspace()).strip()
+                if nm and len(nm) >= 3:
+                    return nm, "bfst"
+        else:
+            words = [w for w in cnt.split() if w.isalpha() and len(w) >= 2]
+            if words:
+                return ' '.join(words), "bfst"
+
+    # IBIZ
+    if "IBIZ" in cleaned.upper() and " TO " in cleaned.upper():
+        parts = cleaned.split(" TO ")
+        if len(parts) > 1:
+            receiver_part = parts[1].split("ESB:")[0].strip()
+            words = [w for w in receiver_part.split() if w.isalpha() and len(w) >= 2]
+            if words:
+                return ' '.join(words[:4]), "ibiz"
+
+    # Payroll
+    if "PAYROLL" in cleaned.upper():
+        return "PAYROLL", "payroll"
+
+    # Setoran penjualan
+    if "SETOR" in cleaned.upper() and "PENJUALAN" in cleaned.upper():
+        return "PENJUALAN INTERNAL", "setor_penjualan"
+
+    # --- Fallback umum: ambil kandidat nama dari teks yang dibersihkan ---
+    cleaned_up = re.sub(r'ESB:.*', ' ', cleaned, flags=re.DOTALL)
+    cleaned_up = re.sub(r'\b[A-Z]{2,}\d+[A-Z]*\b', ' ', cleaned_up)   # kode seperti BFST123
+    cleaned_up = re.sub(r'\b\d{5,}\b', ' ', cleaned_up)               # angka panjang
+    cleaned_up = re.sub(r'[^A-Za-z\s&\.-]', ' ', cleaned_up)
+    cleaned_up = re.sub(r'\s+', ' ', cleaned_up).strip()
+
+    stop = {"TRANSFER","TRF","KE","TO","BAYAR","PEMBAYARAN","PENERIMA","PENGIRIM",
+            "VIA","BANK","BRI","PT","CV","QRIS","BRIVA","VA","BIFAST","BI","FAST",
+            "RTGS","LLG","KLIRING","ADM","PAJAK","BUNGA","FEE","SETOR","SETORAN"}
+    words = [w for w in cleaned_up.upper().split() if w not in stop and len(w) >= 3]
+    if words:
+        cand = ' '.join(words[:6]).title()
+        if len(cand) >= 3:
+            return cand, "fallback"
+
+    return None, "no_match"
+
+# Potongan yang memicu setiap aturan (dan tabrakan antar-aturan) saat digabung acak
+FRAGMENTS = list(bp.SKIP_KEYWORDS) + [
+    "TRF", "TRANSFER", "BM", "NBMB", "WBNKTRF", "BFST", "IBIZ", " TO ", "PAYROLL", "SETOR", "PENJUALAN",
+    "Bm1", "BM12 3 4 ", "ESB:12", "KE ", "TO ", "\n", " : ", "12345678", "ab", "Budi ", "nbmb ",
+    "wbnktrfx ", " ", "X", "12", "bfst9", "ibiz", "\u00df",
+]
+EDGE_CASES = [None, float("nan"), "", 123, "BFSTAX", "NBMB12 BM3 4 5 X", "wbnktrfee", "  IBIZ X TO ",
+              "x TO\nIBIZ TO Y"]
+EXTRA_DESCRIPTIONS = ["QRIS PEMBAYARAN TOKO", "TRANSFER TO ANDI", "BI-FAST CR 1234", "PEMBELIAN PULSA 0812",
+                      "ATM TARIK TUNAI", "KARTU KREDIT PAYMENT"]
+
+def fuzz_descriptions(n: int, seed: int = 1):
+    rng = random.Random(seed)
+    return ["".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 7))) for _ in range(n)]
+
+def realistic_descriptions(per_template: int, seed: int = 2):
+    rng = random.Random(seed)
+    words = ["ABC", "DEFG", "HIJ", "KLMNO", "PQR"]
+    return [f"{d} {rng.randint(0, 10**9)} " + " ".join(rng.choice(words) for _ in range(4))
+            for d in DESCRIPTIONS + EXTRA_DESCRIPTIONS for _ in range(per_template)]
+
+def per_description_us(fn, descriptions, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for d in descriptions:
+            fn(d)
+        best = min(best, time.perf_counter() - start)
+    return best / len(descriptions) * 1e6
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--fuzz", type=int, default=300_000, help="random descriptions to compare")
+    ap.add_argument("--per-template", type=int, default=2_000, help="realistic descriptions per template")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--show", type=int, default=3, help="print up to N differing descriptions")
+    args = ap.parse_args(argv)
+
+    realistic = realistic_descriptions(args.per_template)
+    cases = EDGE_CASES + fuzz_descriptions(args.fuzz) + realistic
+    diffs = [(d, legacy_match_partner_rule(d), bp._match_partner_rule(d)) for d in cases]
+    diffs = [row for row in diffs if row[1] != row[2]]
+    for d, old, new in diffs[:args.show]:
+        print(f"  {d!r}\n    legacy: {old}\n    now   : {new}")
+    print(f"{len(cases)} descriptions, {len(diffs)} differ from the legacy extractor")
+
+    t_old = per_description_us(legacy_match_partner_rule, realistic, args.repeat)
+    t_new = per_description_us(bp._match_partner_rule, realistic, args.repeat)
+    print(f"legacy : {t_old:6.2f} us/description")
+    print(f"now    : {t_new:6.2f} us/description  ({t_old / t_new:.1f}x)")
+    return 1 if diffs else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
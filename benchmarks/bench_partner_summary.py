@@ -0,0 +1,85 @@
+# benchmarks/bench_partner_summary.py
+"""create_partner_summary_table: loop filter per partner (lama) vs satu groupby.
+
+    python benchmarks/bench_partner_summary.py --partners 5000 --rows 200000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bri_parser import create_partner_summary_table
+
+def legacy_create_partner_summary_table(partner_df, debit_col='Debit', credit_col='Credit'):
+    """Implementasi sebelum groupby, disimpan sebagai pembanding."""
+    partner_transactions = partner_df[partner_df['partner_name'].notna()].copy()
+    rows = []
+    for partner in partner_transactions['partner_name'].unique():
+        p = partner_transactions[partner_transactions['partner_name'] == partner]
+        rows.append({
+            'Partner': partner,
+            'Total_Credit': p[credit_col].sum(),
+            'Total_Debit':  p[debit_col].sum(),
+            'Credit_Count': int((p[credit_col] > 0).sum()),
+            'Debit_Count':  int((p[debit_col]  > 0).sum()),
+            'Total_Transactions': len(p)
+        })
+    summary_df = pd.DataFrame(rows)
+    summary_df['Total_Volume'] = summary_df['Total_Credit'] + summary_df['Total_Debit']
+    return summary_df.sort_values('Total_Volume', ascending=False).drop(columns=['Total_Volume']).reset_index(drop=True)
+
+def synthetic_partner_frame(n_partners: int, n_rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    names = np.array([f"PARTNER {i:05d}" for i in range(n_partners)], dtype=object)
+    partner = names[rng.integers(0, n_partners, n_rows)]
+    partner[rng.random(n_rows) < 0.1] = None  # baris tanpa partner (biaya, bunga, ...)
+    amount = rng.integers(1_000, 50_000_000, n_rows) / 100
+    is_debit = rng.random(n_rows) < 0.5
+    return pd.DataFrame({
+        'Date': '01/01/24',
+        'Remark': partner,
+        'Debit': np.where(is_debit, amount, 0.0),
+        'Credit': np.where(is_debit, 0.0, amount),
+        'partner_name': partner,
+    })
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--partners", type=int, default=5_000)
+    ap.add_argument("--rows", type=int, default=200_000)
+    ap.add_argument("--skip-legacy", action="store_true", help="only time the groupby version")
+    args = ap.parse_args(argv)
+
+    df = synthetic_partner_frame(args.partners, args.rows)
+
+    start = time.perf_counter()
+    new = create_partner_summary_table(df)
+    t_new = time.perf_counter() - start
+    print(f"partners: {len(new)}  rows: {len(df)}")
+    print(f"groupby: {t_new:8.3f}s")
+
+    # Jalur integer_cents: kolom nominal int64 sen, jumlahnya eksak
+    cents_df = df.assign(Debit=(df['Debit'] * 100).round().astype('int64'),
+                         Credit=(df['Credit'] * 100).round().astype('int64'))
+    start = time.perf_counter()
+    cents = create_partner_summary_table(cents_df)
+    t_cents = time.perf_counter() - start
+    drift = np.abs(new['Total_Credit'].to_numpy() * 100 - cents['Total_Credit'].to_numpy()).max()
+    print(f"groupby (int cents): {t_cents:8.3f}s  max float drift vs exact: {drift:.2e} cents")
+    if args.skip_legacy:
+        return 0
+
+    start = time.perf_counter()
+    old = legacy_create_partner_summary_table(df)
+    t_old = time.perf_counter() - start
+    pd.testing.assert_frame_equal(new, old)
+    print(f"legacy : {t_old:8.3f}s  ({t_old / t_new:.0f}x slower)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
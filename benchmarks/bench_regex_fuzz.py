@@ -0,0 +1,142 @@
+# benchmarks/bench_regex_fuzz.py
+"""Fuzz pola regex header/summary/baris dengan input adversarial (anti catastrophic backtracking).
+
+Setiap dokumen berisi label-label header yang masing-masing diikuti blok filler
+panjang (spasi, baris kosong, huruf kapital berselang spasi, ...) dan diakhiri
+karakter yang tidak pernah cocok. Script keluar dengan status 1 kalau satu pola
+melewati --ceiling detik, satu extractor melewati --extractor-ceiling, atau waktu
+naik lebih dari --max-growth kali saat input diperbesar 4x (linear ~4x, kuadratik ~16x).
+
+    python benchmarks/bench_regex_fuzz.py --size 1000000 --ceiling 1.0
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import bri_parser as bp
+
+ANCHORS = [
+    "Kepada Yth. / To :\n",
+    "Kepada Yth. / To :\nBUDI\n",
+    "No. Rekening Account No :",
+    "Tanggal Laporan :",
+    "Periode Transaksi : 01/01/25",
+    "Nama Produk :",
+    "Valuta Currency :",
+    "Unit Kerja Business Unit :",
+    "Alamat Unit Kerja :",
+    "Alamat Unit Kerja :\nJL SUDIRMAN\n",
+    "Saldo Awal Opening Balance",
+    "Account No :",
+    "Account Name :",
+    "Period :",
+    "OPENING BALANCE TOTAL DEBET TOTAL CREDIT CLOSING BALANCE",
+    "01/01/25 10:00:00 ",
+]
+
+FILLERS = {
+    "spaces": " ",
+    "newlines": "\n",
+    "space-newline": " \n",
+    "upper-words": "AB ",
+    "upper-lines": "A\n",
+    "amounts": "1,0 ",
+}
+
+GROWTH_MIN_SECONDS = 0.01  # di bawah ini rasio waktu didominasi noise
+
+def header_patterns():
+    """Semua pola ter-compile yang dijalankan terhadap teks header/summary."""
+    groups = {
+        "CMS_ACCOUNT_NO": bp.CMS_ACCOUNT_NO_PATTERNS,
+        "CMS_ACCOUNT_NAME": bp.CMS_ACCOUNT_NAME_PATTERNS,
+        "CMS_PERIOD": bp.CMS_PERIOD_PATTERNS,
+        "CMS_SUMMARY": [bp.CMS_SUMMARY_PATTERN],
+        "NAMA": [bp.NAMA_BLOCK_START, bp.NAMA_BLOCK_END] + bp.NAMA_PATTERNS,
+        "TANGGAL": bp.TANGGAL_PATTERNS,
+        "PERIODE": bp.PERIODE_PATTERNS,
+        "REKENING": bp.REKENING_PATTERNS,
+        "PRODUK": bp.PRODUK_PATTERNS,
+        "VALUTA": bp.VALUTA_PATTERNS,
+        "UNIT": bp.UNIT_PATTERNS,
+        "ALAMAT_UNIT_KERJA": bp.ALAMAT_UNIT_KERJA_PATTERNS,
+        "BALANCE_SUMMARY": [bp.BALANCE_SUMMARY_PATTERN],
+        "MARKERS": bp.CMS_MARKERS + bp.E_STATEMENT_MARKERS,
+    }
+    for name, patterns in groups.items():
+        for i, p in enumerate(patterns):
+            yield f"{name}[{i}]", p.search
+
+    yield "CMS_ROW", lambda text: bp.CMS_ROW.match(text.strip())
+    yield "NAMA_PERIODE_SUFFIX", bp.NAMA_PERIODE_SUFFIX.search
+    yield "_search_nama_block", bp._search_nama_block
+
+def extractors():
+    yield "extract_cms_account_info", bp.extract_cms_account_info
+    yield "extract_cms_summary", bp.extract_cms_summary
+    yield "extract_personal_info", bp.extract_personal_info
+    yield "extract_cms_transactions", bp.extract_cms_transactions
+    yield "extract_transactions", bp.extract_transactions
+    yield "sniff_format", bp.sniff_format
+
+def adversarial_document(filler: str, size: int) -> str:
+    block = filler * max(1, size // (len(ANCHORS) * len(filler)))
+    return "".join(anchor + block + "#" for anchor in ANCHORS)
+
+def single_line(filler: str, size: int) -> str:
+    """Satu baris panjang berawalan tanggal/jam: input terburuk untuk pola per baris."""
+    return ANCHORS[-1] + (filler.replace("\n", " ") * (size // len(filler))) + "#"
+
+def timed(fn, arg) -> float:
+    start = time.perf_counter()
+    fn(arg)
+    return time.perf_counter() - start
+
+def build_cases(size: int):
+    cases = {}
+    for name, filler in FILLERS.items():
+        cases[f"doc/{name}"] = adversarial_document(filler, size)
+        cases[f"line/{name}"] = single_line(filler, size)
+    return cases
+
+def worst_time(fn, cases):
+    return max(((case, timed(fn, text)) for case, text in cases.items()), key=lambda r: r[1])
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--size", type=int, default=1_000_000, help="approximate characters per input")
+    ap.add_argument("--ceiling", type=float, default=1.0, help="max seconds per pattern search")
+    ap.add_argument("--extractor-ceiling", type=float, default=5.0, help="max seconds per extractor call")
+    ap.add_argument("--max-growth", type=float, default=8.0, help="max time ratio between size and size/4")
+    args = ap.parse_args(argv)
+
+    cases = build_cases(args.size)
+    small_cases = build_cases(args.size // 4)
+    checks = [(label, fn, args.ceiling) for label, fn in header_patterns()]
+    checks += [(label, fn, args.extractor_ceiling) for label, fn in extractors()]
+
+    failures = 0
+    print(f"{len(checks)} checks x {len(cases)} inputs, size~{args.size:,} chars")
+    for label, fn, ceiling in checks:
+        worst_case, worst = worst_time(fn, cases)
+        small = timed(fn, small_cases[worst_case])
+        growth = worst / small if small > 0 else 0.0
+        if worst > ceiling:
+            status = "SLOW"
+        elif worst >= GROWTH_MIN_SECONDS and growth > args.max_growth:
+            status = "GROW"
+        else:
+            status = "ok"
+        failures += status != "ok"
+        print(f"{status:<4} {label:<28} worst {worst:8.4f}s  x{growth:5.1f} vs size/4  ({worst_case})")
+
+    if failures:
+        print(f"{failures} check(s) exceeded their time budget", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
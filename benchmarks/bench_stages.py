@@ -0,0 +1,178 @@
+# benchmarks/bench_stages.py
+"""Waktu per tahap parse_bri_statement pada korpus tetap, dibandingkan dengan baseline.
+
+Tahap: pdf_text, header, summary, rows, partner_extract, partner_aggregation,
+analytics, excel. Setiap PDF dijalankan di proses baru supaya peak RSS tidak
+tercampur antar dokumen; peak RSS per tahap adalah puncak proses sampai tahap itu
+selesai. Tanpa --corpus, korpus sintetis dibuat ulang secara
+deterministik (benchmarks/synthetic_pdf.py).
+
+    python benchmarks/bench_stages.py --pages 10 50 --save-baseline bench_baseline.json
+    python benchmarks/bench_stages.py --pages 10 50 --baseline bench_baseline.json --threshold 0.2
+    python benchmarks/bench_stages.py --corpus /secure/statements --baseline bench_baseline.json
+"""
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.synthetic import LAYOUTS
+from benchmarks.synthetic_pdf import generate
+
+STAGES = ["pdf_text", "header", "summary", "rows", "partner_extract",
+          "partner_aggregation", "analytics", "excel"]
+# Satuan throughput yang relevan per tahap
+STAGE_UNITS = {"pdf_text": "pages", "header": "pages", "summary": "pages"}
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss: KiB di Linux, byte di macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def run_stages(pdf_path: str, repeat: int, pdf_workers: int) -> Dict:
+    """Jalankan semua tahap untuk satu PDF; waktu terbaik dari `repeat` kali per tahap."""
+    import pandas as pd
+
+    import bri_parser as bp
+    from bri_export import write_excel_workbook
+    from bri_pdf import read_pdf_pages
+
+    stages = {}
+
+    def stage(name, fn, before=None):
+        best, out = float("inf"), None
+        for _ in range(repeat):
+            if before:
+                before()
+            start = time.perf_counter()
+            out = fn()
+            best = min(best, time.perf_counter() - start)
+        stages[name] = {"seconds": best, "peak_rss_mb": _peak_rss_mb()}
+        return out
+
+    pages = stage("pdf_text", lambda: read_pdf_pages(pdf_path, workers=pdf_workers))
+    fmt = bp.FORMATS[bp.sniff_format(bp.first_page_text(pages)) or bp.detect_format_by_filename(pdf_path)]
+    region = bp.header_region(pages)
+    personal_info = stage("header", lambda: fmt.extract_header(region))
+    summary_info = stage("summary", lambda: fmt.extract_summary(region))
+    trx_df = stage("rows", lambda: bp.transactions_frame(fmt.parse_rows(bp.iter_lines(pages))))
+
+    partner_table = analytics_df = pd.DataFrame()
+    if not trx_df.empty:  # sama seperti parse_bri_pages: tahap partner dilewati kalau tidak ada transaksi
+        desc_col = "Remark" if bp.detect_bri_format(trx_df) == "CMS" else "deskripsi"
+        stage("partner_extract", lambda: bp.extract_partner_names(trx_df[desc_col]), before=bp.clear_partner_cache)
+        # Nama partner sudah di cache dari tahap sebelumnya, jadi yang terukur terutama agregasinya
+        partner_df, partner_table = stage("partner_aggregation", lambda: bp.analyze_bri_partners_unified(trx_df))
+        base_stats_df = partner_df if "partner_name" in partner_df.columns else trx_df
+        analytics_df = stage("analytics", lambda: bp.create_partner_statistics_summary(base_stats_df))
+
+    result = (pd.DataFrame([personal_info]), pd.DataFrame([summary_info]), trx_df, partner_table, analytics_df)
+    with tempfile.TemporaryDirectory() as tmp:
+        stage("excel", lambda: write_excel_workbook(Path(tmp) / "out.xlsx", *result))
+
+    n_pages, n_rows = len(pages), len(trx_df)
+    for name, s in stages.items():
+        s["pages_per_s"] = n_pages / s["seconds"] if s["seconds"] else None
+        s["rows_per_s"] = n_rows / s["seconds"] if s["seconds"] else None
+    return {"format": fmt.name, "pages": n_pages, "rows": n_rows, "stages": stages}
+
+def build_corpus(pages: List[int], out_dir: Path) -> List[Path]:
+    return [generate(out_dir, layout, n) for n in pages for layout in LAYOUTS]
+
+def run_corpus(pdfs: List[Path], repeat: int, pdf_workers: int) -> Dict:
+    results = {}
+    ctx = multiprocessing.get_context("spawn")
+    for pdf in pdfs:
+        # Proses baru per dokumen: peak RSS dan cache partner tidak terbawa ke dokumen berikutnya
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+            results[pdf.name] = pool.submit(run_stages, str(pdf), repeat, pdf_workers).result()
+        print_document(pdf.name, results[pdf.name])
+    return results
+
+def print_document(name: str, doc: Dict) -> None:
+    print(f"\n{name}  [{doc['format']}, {doc['pages']} pages, {doc['rows']} rows]")
+    for stage_name in STAGES:
+        s = doc["stages"].get(stage_name)
+        if s is None:
+            print(f"  {stage_name:<20} skipped")
+            continue
+        unit = STAGE_UNITS.get(stage_name, "rows")
+        rate = s[f"{unit}_per_s"]
+        rate_txt = f"{rate:14,.0f} {unit}/s" if rate is not None else " " * 14 + f" {unit}/s"
+        print(f"  {stage_name:<20} {s['seconds']:9.4f}s {rate_txt}  peak RSS {s['peak_rss_mb']:8.1f} MB")
+
+def compare(results: Dict, baseline: Dict, threshold: float, min_seconds: float) -> int:
+    """Cetak perbandingan dengan baseline; kembalikan jumlah tahap yang melambat > threshold."""
+    regressions = 0
+    print(f"\nComparison with baseline (threshold +{threshold:.0%}):")
+    for doc_name, doc in results.items():
+        base_doc = baseline.get("results", {}).get(doc_name)
+        if base_doc is None:
+            print(f"  {doc_name}: not in baseline")
+            continue
+        for stage_name in STAGES:
+            cur_stage, base_stage = doc["stages"].get(stage_name), base_doc["stages"].get(stage_name)
+            if not cur_stage or not base_stage or not base_stage["seconds"]:
+                continue
+            cur, base = cur_stage["seconds"], base_stage["seconds"]
+            ratio = cur / base
+            flag = ""
+            if ratio > 1 + threshold and cur >= min_seconds:
+                flag = "  REGRESSION"
+                regressions += 1
+            rss_delta = cur_stage["peak_rss_mb"] - base_stage["peak_rss_mb"]
+            print(f"  {doc_name:<40} {stage_name:<20} {base:9.4f}s -> {cur:9.4f}s  x{ratio:5.2f}  "
+                  f"RSS {rss_delta:+7.1f} MB{flag}")
+    return regressions
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--corpus", help="folder of PDFs to benchmark instead of the synthetic corpus")
+    ap.add_argument("--pages", type=int, nargs="+", default=[10, 50], help="synthetic corpus page counts")
+    ap.add_argument("--repeat", type=int, default=3, help="best-of-N per stage")
+    ap.add_argument("--pdf-workers", type=int, default=1, help="workers for PDF text extraction")
+    ap.add_argument("--baseline", help="JSON from an earlier --save-baseline run to compare against")
+    ap.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown per stage (0.2 = +20%%)")
+    ap.add_argument("--min-seconds", type=float, default=0.02,
+                    help="stages faster than this are reported but never flagged (timer noise)")
+    ap.add_argument("--save-baseline", help="write this run's results to JSON")
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.corpus:
+            pdfs = sorted(Path(args.corpus).glob("*.pdf"))
+        else:
+            pdfs = build_corpus(args.pages, Path(tmp))
+        if not pdfs:
+            print("No PDF files found.", file=sys.stderr)
+            return 1
+        results = run_corpus(pdfs, args.repeat, args.pdf_workers)
+
+    run = {
+        "meta": {"python": platform.python_version(), "platform": platform.platform(),
+                 "repeat": args.repeat, "pdf_workers": args.pdf_workers},
+        "results": results,
+    }
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(json.dumps(run, indent=2))
+        print(f"\nBaseline written to {args.save_baseline}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(results, baseline, args.threshold, args.min_seconds)
+        if regressions:
+            print(f"{regressions} stage(s) regressed beyond +{args.threshold:.0%}", file=sys.stderr)
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+# benchmarks/check_regressions.py
+"""Cek regresi kecil untuk bug yang pernah lolos review; keluar dengan status 1 kalau ada yang gagal.
+
+    python benchmarks/check_regressions.py
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+def check_output_stems():
+    """Akhiran _N tidak boleh bentrok dengan nama asli PDF lain atau akhiran yang sudah dibagikan."""
+    from app import output_stems
+
+    pdfs = [Path("d1/a.pdf"), Path("d2/a.pdf"), Path("d3/a_2.pdf")]
+    stems = output_stems(pdfs)
+    assert len({s.casefold() for s in stems.values()}) == len(pdfs), stems
+    assert stems[Path("d1/a.pdf")] == "a" and stems[Path("d3/a_2.pdf")] == "a_2", stems
+
+    pdfs = [Path("d1/a.pdf"), Path("d2/a.pdf"), Path("d3/a.pdf"), Path("d4/A.pdf"), Path("d5/a_3.pdf")]
+    stems = output_stems(pdfs)
+    assert len({s.casefold() for s in stems.values()}) == len(pdfs), stems
+
+def check_cache_size_tracking():
+    """Total ukuran di memori sama dengan isi folder, dan eviksi tetap menjaga batas max_bytes."""
+    import bri_cache
+
+    with tempfile.TemporaryDirectory() as root:
+        for i in range(60):
+            # satu StatementCache per file, seperti worker batch
+            bri_cache.StatementCache(root, max_bytes=200_000).put_pages(f"{i:064x}", [str(i) * 2000])
+        real = sum(f.stat().st_size for entry in Path(root).iterdir() for f in entry.iterdir())
+        assert real <= 200_000, real
+        assert bri_cache._USAGE[Path(root).resolve()]["total"] == real
+
+def check_cache_roundtrip():
+    """Hit cache hasil harus mengembalikan tabel dan metrik (termasuk jumlah halaman) yang sama."""
+    from bri_cache import StatementCache
+    from bri_parser import parse_bri_statement
+    from benchmarks.synthetic_pdf import generate
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf = generate(tmp, "estatement", 3)
+        cache = StatementCache(Path(tmp) / "cache")
+        first = parse_bri_statement(pdf, pdf.name, cache=cache, pdf_workers=1)
+        second = parse_bri_statement(pdf, pdf.name, cache=cache, pdf_workers=1)
+        assert (first.metrics["cache"], second.metrics["cache"]) == ("miss", "result"), \
+            (first.metrics["cache"], second.metrics["cache"])
+        assert second.metrics["pages"] == first.metrics["pages"] == 3, (first.metrics["pages"], second.metrics["pages"])
+        assert second.metrics["rows"] == first.metrics["rows"]
+        for a, b in zip(first, second):
+            assert a.equals(b), (a.head(), b.head())
+
+CHECKS = [check_output_stems, check_cache_size_tracking, check_cache_roundtrip]
+
+def main() -> int:
+    failed = 0
+    for check in CHECKS:
+        try:
+            check()
+            print(f"ok    {check.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL  {check.__name__}: {e}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+# benchmarks/synthetic.py
+"""Baris transaksi dan halaman rekening koran sintetis berformat BRI untuk benchmark (tanpa data nasabah)."""
+import random
+from datetime import date, timedelta
+from typing import List
+
+DESCRIPTIONS = [
+    "NBMB BUDI SANTOSO TO ANI WIJAYA",
+    "WBNKTRF0012345 PT MAJU JAYA ABADI",
+    "BFST20240101123456 : CV SEJAHTERA MANDIRI",
+    "IBIZ PAYMENT 123456789012 TO PT ABADI LESTARI ESB:20240101",
+    "BM0123456 01 0001 SITI AMINAH",
+    "TRF KE RUDI HARTONO",
+    "PAYROLL KARYAWAN JANUARI",
+    "SETOR TUNAI PENJUALAN TOKO 12",
+    "BIAYA ADM BULANAN",
+    "BUNGA TABUNGAN",
+    "PAJAK BUNGA",
+    "QRIS PEMBAYARAN WARUNG MAKMUR",
+]
+CMS_TELLERS = ["8888999", "0372001", "CMSPYRL", "BRIMDBT"]
+
+def _amount(rng: random.Random) -> str:
+    return f"{rng.randint(1, 50_000_000):,}.{rng.randint(0, 99):02d}"
+
+def _row_parts(rng: random.Random, i: int):
+    day = (i % 28) + 1
+    stamp = f"{day:02d}/01/24 {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}"
+    desc = rng.choice(DESCRIPTIONS)
+    if rng.random() < 0.5:
+        debit, credit = _amount(rng), "0.00"
+    else:
+        debit, credit = "0.00", _amount(rng)
+    return stamp, desc, debit, credit, _amount(rng)
+
+def cms_lines(n_rows: int, seed: int = 0) -> List[str]:
+    """Baris CMS 2024: tanggal jam remark debit kredit saldo tellerid."""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(n_rows):
+        stamp, desc, debit, credit, saldo = _row_parts(rng, i)
+        lines.append(f"{stamp} {desc} {debit} {credit} {saldo} {rng.choice(CMS_TELLERS)}")
+    return lines
+
+def estatement_lines(n_rows: int, seed: int = 0) -> List[str]:
+    """Baris e-statement 2025: tanggal jam deskripsi tellerid debit kredit saldo."""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(n_rows):
+        stamp, desc, debit, credit, saldo = _row_parts(rng, i)
+        lines.append(f"{stamp} {desc} {rng.randint(1_000_000, 9_999_999)} {debit} {credit} {saldo}")
+    return lines
+
+# ============== Full Statement Layouts ==============
+
+LAYOUTS = ("cms", "estatement")
+ROWS_PER_PAGE = 55
+
+ACCOUNT = {
+    "cms": {"name": "PT MAJU JAYA ABADI", "number": "0123-01-000123-30-1", "year": 2024},
+    "estatement": {"name": "BUDI SANTOSO", "number": "012301000123307", "year": 2025},
+}
+
+def _money(cents: int) -> str:
+    return f"{cents // 100:,}.{cents % 100:02d}"
+
+def _statement_rows(layout: str, n_rows: int, opening: int, seed: int):
+    """Baris transaksi dengan saldo berjalan, tersebar merata sepanjang satu tahun."""
+    rng = random.Random(seed)
+    start = date(ACCOUNT[layout]["year"], 1, 1)
+    balance, total_debit, total_credit = opening, 0, 0
+    rows = []
+    for i in range(n_rows):
+        day = start + timedelta(days=i * 365 // max(n_rows, 1))
+        stamp = f"{day:%d/%m/%y} {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}"
+        desc = rng.choice(DESCRIPTIONS)
+        amount = rng.randint(100, 5_000_000_00)
+        if rng.random() < 0.5 and balance >= amount:
+            debit, credit = amount, 0
+        else:
+            debit, credit = 0, amount
+        balance += credit - debit
+        total_debit += debit
+        total_credit += credit
+        if layout == "cms":
+            rows.append(f"{stamp} {desc} {_money(debit)} {_money(credit)} {_money(balance)} {rng.choice(CMS_TELLERS)}")
+        else:
+            rows.append(f"{stamp} {desc} {rng.randint(1_000_000, 9_999_999)} "
+                        f"{_money(debit)} {_money(credit)} {_money(balance)}")
+    return rows, (opening, total_debit, total_credit, balance)
+
+def _cms_header(period, totals) -> List[str]:
+    acc = ACCOUNT["cms"]
+    return [
+        "PT. BANK RAKYAT INDONESIA (PERSERO) Tbk.",
+        "ACCOUNT STATEMENT",
+        f"Account No : {acc['number']}",
+        f"Account Name : {acc['name']} Today Hold : 0.00",
+        f"Period : {period[0]:%d/%m/%Y} - {period[1]:%d/%m/%Y}",
+        "OPENING BALANCE TOTAL DEBET TOTAL CREDIT CLOSING BALANCE",
+        " ".join(_money(v) for v in totals),
+        "",
+    ]
+
+def _estatement_header(period) -> List[str]:
+    acc = ACCOUNT["estatement"]
+    return [
+        "LAPORAN TRANSAKSI FINANSIAL",
+        "Statement of Financial Transaction",
+        "Kepada Yth. / To :",
+        "NASABAH YTH",
+        acc["name"],
+        "JL MERDEKA NO 17 RT 001 RW 002",
+        "JAKARTA PUSAT",
+        "No. Rekening",
+        f"Account No : {acc['number']}",
+        f"Tanggal Laporan : {period[1] + timedelta(days=1):%d/%m/%y}",
+        f"Periode Transaksi : {period[0]:%d/%m/%y} - {period[1]:%d/%m/%y}",
+        "Nama Produk : BRITAMA BISNIS",
+        "Valuta : IDR",
+        "Unit Kerja : KCP JAKARTA SUDIRMAN",
+        "Alamat Unit Kerja :",
+        "JL JENDERAL SUDIRMAN",
+        "JAKARTA SELATAN",
+        "",
+    ]
+
+def _estatement_summary(totals) -> List[str]:
+    return [
+        "",
+        "Saldo Awal", "Opening Balance",
+        "Total Transaksi Debet", "Total Debit Transaction",
+        "Total Transaksi Kredit", "Total Credit Transaction",
+        "Saldo Akhir", "Closing Balance",
+        " ".join(_money(v) for v in totals),
+    ]
+
+COLUMN_HEADERS = {
+    "cms": "Date Time Remark Debet Credit Ledger Teller ID",
+    "estatement": "Tanggal Transaksi Uraian Transaksi Teller Debet Kredit Saldo",
+}
+
+def statement_pages(layout: str, n_pages: int, rows_per_page: int = ROWS_PER_PAGE, seed: int = 0) -> List[List[str]]:
+    """Baris teks per halaman untuk satu rekening koran sintetis lengkap.
+
+    Header rekening di halaman pertama (pola extract_cms_account_info /
+    extract_personal_info), header kolom di setiap halaman, ringkasan saldo di
+    halaman pertama (CMS) atau terakhir (e-statement) dan konsisten dengan barisnya.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"layout must be one of {LAYOUTS}")
+    rows, totals = _statement_rows(layout, n_pages * rows_per_page, 100_000_000_00, seed)
+    year = ACCOUNT[layout]["year"]
+    period = (date(year, 1, 1), date(year, 12, 31))
+
+    pages = []
+    for p in range(n_pages):
+        lines = []
+        if p == 0:
+            lines += _cms_header(period, totals) if layout == "cms" else _estatement_header(period)
+        lines.append(COLUMN_HEADERS[layout])
+        lines += rows[p * rows_per_page:(p + 1) * rows_per_page]
+        if layout == "estatement" and p == n_pages - 1:
+            lines += _estatement_summary(totals)
+        lines.append(f"Halaman {p + 1} dari {n_pages}")
+        pages.append(lines)
+    return pages
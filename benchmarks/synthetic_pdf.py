@@ -0,0 +1,92 @@
+# benchmarks/synthetic_pdf.py
+"""PDF rekening koran sintetis (CMS 2024 / e-statement 2025) untuk benchmark.
+
+PDF ditulis langsung (satu font Helvetica, satu baris teks per baris layout)
+tanpa dependensi tambahan, sehingga pdfplumber mengekstrak teksnya persis
+seperti baris di benchmarks.synthetic.statement_pages.
+
+    python benchmarks/synthetic_pdf.py --pages 10 500 5000 -o corpus/
+    python benchmarks/synthetic_pdf.py --layout cms --pages 50 -o corpus/
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.synthetic import LAYOUTS, ROWS_PER_PAGE, statement_pages
+
+PAGE_WIDTH, PAGE_HEIGHT = 842, 1191  # A3 portrait, cukup untuk header + ROWS_PER_PAGE baris
+FONT_SIZE, LEADING = 8, 10
+
+# Nama file ikut mengandung kata kunci detect_format_by_filename
+FILE_NAMES = {
+    "cms": "synthetic_cms_2024_{pages}p.pdf",
+    "estatement": "synthetic_e-statement_2025_{pages}p.pdf",
+}
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def _content_stream(lines: List[str]) -> bytes:
+    parts = [f"BT /F1 {FONT_SIZE} Tf {LEADING} TL 20 {PAGE_HEIGHT - 20} Td"]
+    parts += [f"({_escape(line)}) Tj T*" for line in lines]
+    parts.append("ET")
+    return "\n".join(parts).encode("latin-1")
+
+def write_pdf(path, pages: List[List[str]]) -> None:
+    """Tulis PDF dengan satu halaman per list baris; objek ditulis berurutan ke file."""
+    n = len(pages)
+    font_id = 3 + 2 * n
+    offsets = []
+
+    with open(path, "wb") as f:
+        def obj(body: bytes) -> None:
+            offsets.append(f.tell())
+            f.write(f"{len(offsets)} 0 obj\n".encode() + body + b"\nendobj\n")
+
+        f.write(b"%PDF-1.4\n")
+        obj(b"<< /Type /Catalog /Pages 2 0 R >>")
+        kids = " ".join(f"{3 + 2 * i} 0 R" for i in range(n))
+        obj(f"<< /Type /Pages /Kids [{kids}] /Count {n} >>".encode())
+        for i, lines in enumerate(pages):
+            obj(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+                f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {4 + 2 * i} 0 R >>".encode())
+            data = _content_stream(lines)
+            obj(b"<< /Length %d >>\nstream\n" % len(data) + data + b"\nendstream")
+        obj(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+        xref = f.tell()
+        f.write(f"xref\n0 {len(offsets) + 1}\n0000000000 65535 f \n".encode())
+        f.write("".join(f"{o:010d} 00000 n \n" for o in offsets).encode())
+        f.write(f"trailer\n<< /Size {len(offsets) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+
+def generate(out_dir, layout: str, n_pages: int, rows_per_page: int = ROWS_PER_PAGE, seed: int = 0) -> Path:
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    path = out_dir / FILE_NAMES[layout].format(pages=n_pages)
+    write_pdf(path, statement_pages(layout, n_pages, rows_per_page, seed))
+    return path
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--layout", choices=[*LAYOUTS, "all"], default="all")
+    ap.add_argument("--pages", type=int, nargs="+", default=[10], help="one PDF per page count")
+    ap.add_argument("--rows-per-page", type=int, default=ROWS_PER_PAGE)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("-o", "--output-dir", default="synthetic_pdfs")
+    args = ap.parse_args(argv)
+
+    layouts = LAYOUTS if args.layout == "all" else [args.layout]
+    for n_pages in args.pages:
+        for layout in layouts:
+            start = time.perf_counter()
+            path = generate(args.output_dir, layout, n_pages, args.rows_per_page, args.seed)
+            print(f"{path} ({n_pages} pages, {path.stat().st_size / 1e6:.1f} MB, "
+                  f"{time.perf_counter() - start:.1f}s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+# bri_cache.py
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "bri_estatement"
+DEFAULT_CACHE_MAX_BYTES = 1 << 30  # 1 GiB
+
+# Urutan tabel sama dengan tuple hasil parse_bri_statement
+RESULT_TABLES = ["account_info", "summary", "transactions", "partner_summary", "analytics"]
+
+# Scan ulang folder cache setiap 1/RESCAN_FRACTION max_bytes ditulis proses ini, supaya tulisan
+# proses lain (worker batch) ikut terhitung; selisih maksimal ~ jumlah proses x max_bytes / 8.
+# Eviksi juga menyisakan ruang sebesar itu, jadi cache yang penuh tidak di-scan di setiap tulis
+RESCAN_FRACTION = 8
+
+# Ukuran cache per root di proses ini: satu scan saat pertama dipakai, lalu diperbarui
+# setiap tulis/eviksi. Dibagi semua StatementCache di proses yang sama (satu per file di batch)
+_USAGE: Dict[Path, Dict[str, int]] = {}
+
+# ============== Content-addressed Cache ==============
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+class StatementCache:
+    """Cache on-disk untuk teks halaman dan hasil parse, dengan batas ukuran + eviksi LRU.
+
+    Setiap entri adalah satu folder berisi file Parquet; waktu akses dicatat lewat
+    mtime folder sehingga eviksi cukup mengurutkan folder. Ukuran total disimpan di
+    memori (_USAGE), jadi folder hanya di-scan saat batas terlewati atau waktunya resync.
+    - ``pages-<sha256>``: teks mentah per halaman (tidak tergantung versi parser)
+    - ``result-<sha256>-<parser_version>``: lima DataFrame output
+    """
+
+    def __init__(self, root=DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    # ---- raw page text ----
+
+    def get_pages(self, digest: str) -> Optional[List[str]]:
+        entry = self._hit(f"pages-{digest}")
+        if entry is None:
+            return None
+        try:
+            return pd.read_parquet(entry / "pages.parquet")["text"].tolist()
+        except Exception as e:
+            logger.warning("Error reading cache entry %s: %s", entry.name, e)
+            return None
+
+    def put_pages(self, digest: str, pages: List[str]) -> None:
+        self._write(f"pages-{digest}", {"pages": pd.DataFrame({"text": pages})})
+
+    # ---- parse results ----
+
+    def get_result(self, digest: str, parser_version: str) -> Optional[Tuple[tuple, Optional[int]]]:
+        """(lima DataFrame, jumlah halaman PDF); halaman None untuk entri yang ditulis sebelum dicatat."""
+        entry = self._hit(f"result-{digest}-{parser_version}")
+        if entry is None:
+            return None
+        try:
+            manifest = json.loads((entry / "manifest.json").read_text())
+            tables = []
+            for name in RESULT_TABLES:
+                df = pd.read_parquet(entry / f"{name}.parquet")
+                if df.columns.empty and manifest["rows"][name]:
+                    # Parquet tidak menyimpan jumlah baris untuk tabel tanpa kolom
+                    df = pd.DataFrame(index=range(manifest["rows"][name]))
+                tables.append(df)
+            return tuple(tables), manifest.get("pages")
+        except Exception as e:
+            logger.warning("Error reading cache entry %s: %s", entry.name, e)
+            return None
+
+    def put_result(self, digest: str, parser_version: str, result, pages: int) -> None:
+        self._write(f"result-{digest}-{parser_version}", dict(zip(RESULT_TABLES, result)), {"pages": pages})
+
+    # ---- internals ----
+
+    def _hit(self, name: str) -> Optional[Path]:
+        entry = self.root / name
+        if not entry.is_dir():
+            return None
+        try:
+            os.utime(entry)  # tandai sebagai baru dipakai (LRU)
+        except OSError:
+            return None
+        return entry
+
+    def _write(self, name: str, tables: Dict[str, pd.DataFrame], meta: Optional[Dict] = None) -> None:
+        entry = self.root / name
+        if entry.is_dir():
+            return
+        tmp = Path(tempfile.mkdtemp(prefix=".tmp-", dir=self.root))
+        try:
+            for table_name, df in tables.items():
+                df.to_parquet(tmp / f"{table_name}.parquet", index=False)
+            manifest = {"rows": {table_name: len(df) for table_name, df in tables.items()}, **(meta or {})}
+            (tmp / "manifest.json").write_text(json.dumps(manifest))
+            size = _entry_size(tmp)
+            try:
+                os.rename(tmp, entry)  # atomik; gagal kalau proses lain sudah menulis entri yang sama
+            except OSError:
+                if not entry.is_dir():
+                    raise
+                shutil.rmtree(tmp, ignore_errors=True)  # kalah balapan dengan worker lain: isinya sama
+                return
+        except Exception as e:
+            logger.warning("Error writing cache entry %s: %s", name, e)
+            shutil.rmtree(tmp, ignore_errors=True)
+            return
+        self._account(size)
+
+    def _account(self, added: int) -> None:
+        """Tambah ukuran entri baru; scan + eviksi hanya kalau total melewati batas (atau waktunya resync)."""
+        usage = _USAGE.get(self.root.resolve())
+        if usage is None:
+            self.evict()  # scan pertama di proses ini, entri baru sudah ikut terhitung
+            return
+        usage["total"] += added
+        usage["since_scan"] += added
+        if usage["total"] > self.max_bytes or usage["since_scan"] > self.max_bytes // RESCAN_FRACTION:
+            self.evict()
+
+    def evict(self) -> None:
+        """Scan semua entri; kalau total > max_bytes, hapus yang paling lama tidak dipakai
+        sampai tersisa ruang max_bytes / RESCAN_FRACTION."""
+        entries = []
+        total = 0
+        for entry in self.root.iterdir():
+            if not entry.is_dir() or entry.name.startswith(".tmp-"):
+                continue
+            try:
+                size = _entry_size(entry)
+                entries.append((entry.stat().st_mtime, size, entry))
+            except OSError:
+                continue  # entri sedang dihapus proses lain
+            total += size
+        target = self.max_bytes - self.max_bytes // RESCAN_FRACTION if total > self.max_bytes else total
+        for _, size, entry in sorted(entries, key=lambda e: e[0]):
+            if total <= target:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+        _USAGE[self.root.resolve()] = {"total": total, "since_scan": 0}
+
+def _entry_size(entry: Path) -> int:
+    return sum(f.stat().st_size for f in entry.iterdir())
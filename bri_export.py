@@ -0,0 +1,163 @@
+# bri_export.py
+import io
+import math
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import List
+
+import pandas as pd
+import xlsxwriter
+
+from bri_cache import RESULT_TABLES
+from bri_parser import AMOUNT_COLUMNS, cents_to_float, safe_filename
+
+EXCEL_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+ZIP_MIME = "application/zip"
+
+# Format ekspor -> (akhiran file download, MIME). parquet/csv.gz = satu file per tabel, di-zip untuk download
+EXPORT_FORMATS = {
+    "xlsx": (".xlsx", EXCEL_MIME),
+    "parquet": (".parquet.zip", ZIP_MIME),
+    "csv.gz": (".csv.zip", ZIP_MIME),
+}
+EXCEL_MAX_ROWS = 1_048_576  # batas baris per sheet Excel, termasuk header
+EXCEL_SHEET_NAME_MAX = 31
+
+# Sama dengan gaya header pandas.to_excel
+HEADER_FORMAT = {"bold": True, "border": 1, "align": "center", "valign": "top"}
+
+# ============== Excel Export ==============
+
+def amounts_to_decimal(df: pd.DataFrame) -> pd.DataFrame:
+    """Kolom nominal int sen (hasil integer_cents=True) -> rupiah desimal untuk ditampilkan/diekspor."""
+    cols = [c for c in df.columns if c in AMOUNT_COLUMNS and pd.api.types.is_integer_dtype(df[c])]
+    if not cols:
+        return df
+    return df.assign(**{c: cents_to_float(df[c].to_numpy()) for c in cols})
+
+def _column_writer(worksheet, series: pd.Series):
+    """(fungsi tulis, nilai) untuk satu kolom; dipilih sekali per kolom, bukan per sel."""
+    if pd.api.types.is_bool_dtype(series):
+        return worksheet.write_boolean, series.tolist()
+    if pd.api.types.is_numeric_dtype(series):
+        return worksheet.write_number, series.tolist()
+    return worksheet.write, series.astype(object).tolist()
+
+def _is_blank(value) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+def _spill_sheet_names(name: str, n_rows: int, rows_per_sheet: int):
+    """'Transactions', 'Transactions (2)', ... sebanyak yang dibutuhkan n_rows."""
+    n_sheets = max(1, -(-n_rows // rows_per_sheet))
+    for i in range(n_sheets):
+        suffix = f" ({i + 1})" if i else ""
+        yield name[:EXCEL_SHEET_NAME_MAX - len(suffix)] + suffix, i * rows_per_sheet
+
+def _write_sheet(workbook, name: str, df: pd.DataFrame, header_format, amount_format,
+                 max_rows: int = EXCEL_MAX_ROWS) -> None:
+    rows_per_sheet = max_rows - 1
+    columns = [str(c) for c in df.columns]
+    for sheet_name, start in _spill_sheet_names(name, len(df), rows_per_sheet):
+        ws = workbook.add_worksheet(sheet_name)
+        if amount_format is not None:
+            for c, col in enumerate(df.columns):
+                if col in AMOUNT_COLUMNS:
+                    ws.set_column(c, c, None, amount_format)
+        if not columns:
+            continue
+        ws.write_row(0, 0, columns, header_format)
+
+        # constant_memory: baris harus ditulis berurutan, jadi iterasi baris di luar, kolom di dalam
+        chunk = df.iloc[start:start + rows_per_sheet]
+        writers = [_column_writer(ws, chunk[col]) for col in chunk.columns]
+        for r in range(len(chunk)):
+            for c, (write, values) in enumerate(writers):
+                value = values[r]
+                if not _is_blank(value):
+                    write(r + 1, c, value)
+
+def write_excel_workbook(path, personal_df, summary_df, trx_df, partner_trx_df, analytics_df,
+                         integer_cents: bool = False, max_rows: int = EXCEL_MAX_ROWS) -> None:
+    """Tulis workbook langsung ke file dengan mode constant_memory xlsxwriter.
+
+    Memori tetap kecil berapa pun jumlah baris; tabel yang melebihi max_rows
+    dilanjutkan di sheet berikutnya ("Transactions (2)", ...).
+    """
+    sheets = [
+        ('Account Info', personal_df),
+        ('Monthly Summary', summary_df),
+        ('Analytics', analytics_df),
+        ('Transactions', trx_df),
+        ('Partner Summary', partner_trx_df),
+    ]
+    workbook = xlsxwriter.Workbook(str(path), {'constant_memory': True, 'strings_to_urls': False})
+    try:
+        header_format = workbook.add_format(HEADER_FORMAT)
+        # Nominal int sen ditulis kembali sebagai desimal dengan format 2 angka di belakang koma
+        amount_format = workbook.add_format({'num_format': '#,##0.00'}) if integer_cents else None
+        for sheet_name, df in sheets:
+            if integer_cents:
+                df = amounts_to_decimal(df)
+            _write_sheet(workbook, sheet_name, df, header_format, amount_format, max_rows)
+    finally:
+        workbook.close()
+
+def build_excel_workbook(personal_df, summary_df, trx_df, partner_trx_df, analytics_df,
+                         integer_cents: bool = False) -> bytes:
+    """Seperti write_excel_workbook, tapi mengembalikan isi file .xlsx (untuk download)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "workbook.xlsx"
+        write_excel_workbook(path, personal_df, summary_df, trx_df, partner_trx_df, analytics_df,
+                             integer_cents=integer_cents)
+        return path.read_bytes()
+
+# ============== Parquet / CSV Export ==============
+
+def write_table_files(out_dir, result, fmt: str) -> List[Path]:
+    """Satu file per tabel hasil parse (urutan RESULT_TABLES) dalam format parquet atau csv.gz.
+
+    Nominal ditulis apa adanya: int64 sen kalau diparse dengan integer_cents=True.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for name, df in zip(RESULT_TABLES, result):
+        if fmt == "parquet":
+            path = out_dir / f"{name}.parquet"
+            df.to_parquet(path, index=False)
+        elif fmt == "csv.gz":
+            path = out_dir / f"{name}.csv.gz"
+            df.to_csv(path, index=False, compression="gzip")
+        else:
+            raise ValueError(f"Unsupported table format: {fmt}")
+        paths.append(path)
+    return paths
+
+def build_export(result, fmt: str, integer_cents: bool = False) -> bytes:
+    """Isi file download untuk satu format: .xlsx, atau zip berisi file per tabel."""
+    if fmt == "xlsx":
+        return build_excel_workbook(*result, integer_cents=integer_cents)
+    output = io.BytesIO()
+    with tempfile.TemporaryDirectory() as tmp:
+        # Isi sudah terkompresi (parquet / gzip), jadi zip cukup ZIP_STORED
+        with zipfile.ZipFile(output, "w", zipfile.ZIP_STORED) as zf:
+            for path in write_table_files(tmp, result, fmt):
+                zf.write(path, path.name)
+    return output.getvalue()
+
+def get_cell(df, col, default="Unknown"):
+    try:
+        val = df.at[0, col]
+        return val if (val is not None and str(val).strip() != "") else default
+    except Exception:
+        return default
+
+def statement_basename(personal_df) -> str:
+    """Nama file output tanpa ekstensi, dari nama/nomor rekening dan tanggal laporan."""
+    account_name = get_cell(personal_df, "Account Name", "UnknownName")
+    account_no   = get_cell(personal_df, "Account Number", "XXXX")
+    report_date  = get_cell(personal_df, "Report Date", "")
+
+    base_name = f"BRI_Statement_Analysis_{account_name}_{account_no}_{report_date}".strip("_")
+    return safe_filename(base_name)
@@ -0,0 +1,1311 @@
+# bri_parser.py
+import re
+import cProfile
+import logging
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from bri_cache import StatementCache, sha256_bytes
+from bri_pdf import iter_lines, join_pages, read_pdf_bytes, stream_pdf_pages
+
+# Naikkan setiap kali output parser berubah supaya hasil lama di cache tidak terpakai
+PARSER_VERSION = "3"
+
+logger = logging.getLogger(__name__)
+
+# Output parser baris: nama kolom -> buffer kolom (list string / array numerik), bukan list of dict
+Columns = Dict[str, Union[List[str], np.ndarray]]
+
+# Semua kolom/field nominal di tabel output. Dengan integer_cents=True nilainya int64 sen
+# (eksak), dan baru dikembalikan ke desimal saat ekspor
+AMOUNT_COLUMNS = frozenset({
+    # transaksi
+    'Debit', 'Credit', 'Saldo', 'debit', 'kredit', 'saldo',
+    # ringkasan saldo (CMS / e-statement)
+    'Saldo Awal', 'Mutasi Debit', 'Mutasi Credit', 'Saldo Akhir',
+    'opening_balance', 'total_debit_transaction', 'total_credit_transaction', 'closing_balance',
+    # partner summary & analytics
+    'Total_Credit', 'Total_Debit', 'Total_Credit_Amount', 'Total_Debit_Amount', 'Top_Partner_Amount',
+})
+
+# ============== General Helpers ==============
+
+def iter_text_lines(src: Union[str, Iterable[str]]) -> Iterable[str]:
+    """Terima teks penuh atau iterable baris (mis. iter_lines(pages)) supaya parser bisa streaming."""
+    if isinstance(src, str):
+        return src.split('\n')
+    return src
+
+def extract_filename_id(filename: str) -> str:
+    if '/' in filename or '\\' in filename:
+        filename = Path(filename).name
+    return os.path.splitext(filename)[0]
+
+def clean_amount(amount_str: str) -> float:
+    if not amount_str or str(amount_str).strip() == '':
+        return 0.0
+    try:
+        cleaned = re.sub(r'[,\s]', '', str(amount_str))
+        # Jika ada titik yang bukan desimal, hilangkan
+        if '.' in cleaned:
+            parts = cleaned.split('.')
+            if not (len(parts) == 2 and len(parts[1]) == 2):
+                cleaned = cleaned.replace('.', '')
+        return float(cleaned)
+    except:
+        return 0.0
+
+# Nominal terbesar yang masih muat sebagai int64 sen
+MAX_CENTS = np.iinfo(np.int64).max
+
+def _amount_to_cents_slow(value) -> int:
+    amount = clean_amount(value)
+    cents = int(round(amount * 100)) if np.isfinite(amount) else 0
+    if abs(cents) > MAX_CENTS:
+        raise OverflowError(f"amount {value!r} does not fit in int64 cents")
+    return cents
+
+def _plain_cents(values):
+    """Jalur vektor: (values sebagai list, int64 sen, indeks yang harus lewat jalur lambat)."""
+    if not isinstance(values, (list, tuple)):
+        values = list(values)  # Series / iterable -> akses posisi untuk jalur lambat
+    try:
+        arr = pa.array(values, type=pa.string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        arr = pa.array([None if v is None else str(v) for v in values], type=pa.string())
+
+    cleaned = pc.utf8_trim_whitespace(pc.replace_substring(arr, ',', ''))
+    has_decimals = pc.fill_null(pc.match_substring_regex(cleaned, r'^\d*\.\d\d$'), False).to_numpy(zero_copy_only=False)
+    # "1.234,00" -> "123400" (rupiah, tanpa desimal), "1.234.567" -> "1234567" (rupiah),
+    # "1234.50" -> "123450" (sudah sen)
+    digits = pc.replace_substring(cleaned, '.', '')
+    # 17 digit masih muat di int64; tanpa desimal masih harus dikali 100, dicek di bawah
+    is_plain = pc.fill_null(pc.match_substring_regex(digits, r'^\d{1,17}$'), False).to_numpy(zero_copy_only=False)
+
+    number = pc.cast(pc.if_else(pa.array(is_plain), digits, '0'), pa.int64()).to_numpy()
+    # Tanpa desimal: x100 overflow di atas MAX_CENTS // 100 -> jalur lambat
+    is_plain &= has_decimals | (number <= MAX_CENTS // 100)
+    cents = np.where(has_decimals, number, np.where(is_plain, number, 0) * 100)
+    return values, cents, np.flatnonzero(~is_plain)
+
+def parse_amount_column(values) -> np.ndarray:
+    """Parse banyak string nominal sekaligus menjadi int64 sen.
+
+    Aturannya sama dengan clean_amount: koma = pemisah ribuan, titik hanya
+    dianggap desimal kalau tepat diikuti 2 digit. Nilai yang tidak berbentuk
+    angka biasa (kosong, tanda minus, dsb.) jatuh ke clean_amount per elemen.
+    Nominal di luar rentang int64 sen menghasilkan OverflowError.
+    """
+    values, cents, slow = _plain_cents(values)
+    for i in slow:
+        cents[i] = _amount_to_cents_slow(values[i])
+    return cents
+
+def parse_amount_floats(values) -> np.ndarray:
+    """Seperti parse_amount_column tapi float64 rupiah; jalur lambat langsung memakai clean_amount."""
+    values, cents, slow = _plain_cents(values)
+    amounts = cents_to_float(cents)
+    for i in slow:
+        amount = clean_amount(values[i])
+        amounts[i] = amount if np.isfinite(amount) else 0.0
+    return amounts
+
+def cents_to_float(cents: np.ndarray) -> np.ndarray:
+    return cents / 100
+
+def _amount_columns(columns: Dict[str, List[str]], integer_cents: bool = False) -> Dict[str, np.ndarray]:
+    """String nominal mentah per kolom -> array int64 sen atau float64, di-parse sekaligus per kolom."""
+    if integer_cents:
+        return {key: parse_amount_column(raw) for key, raw in columns.items()}
+    return {key: parse_amount_floats(raw) for key, raw in columns.items()}
+
+def summary_to_cents(summary: Dict) -> Dict:
+    """Field nominal ringkasan (float dari clean_amount, 2 desimal) -> int sen."""
+    return {k: int(round(v * 100)) if k in AMOUNT_COLUMNS and isinstance(v, float) else v
+            for k, v in summary.items()}
+
+def _amount_scalar(value):
+    """Skalar numpy -> int (sen) / float Python, mengikuti dtype kolom nominal."""
+    return value.item() if hasattr(value, 'item') else value
+
+def transactions_frame(columns: Columns) -> pd.DataFrame:
+    """DataFrame langsung dari buffer kolom; tanpa baris tetap DataFrame kosong tanpa kolom."""
+    if not columns or not len(next(iter(columns.values()))):
+        return pd.DataFrame()
+    return pd.DataFrame(columns, copy=False)
+
+def safe_filename(text: str, default: str = "BRI_Statement_Analysis") -> str:
+    if not text or str(text).strip().lower() in {"none", "nan", "nat"}:
+        text = default
+    text = str(text)
+    text = text.replace("\n", " ").replace("\r", " ").replace("\t", " ")
+    text = re.sub(r"\s+", "_", text).strip("_")
+    text = re.sub(r"[^A-Za-z0-9._-]", "", text)
+    return text[:120] if len(text) > 120 else text
+
+def detect_format_by_filename(filename: str) -> str:
+    """Deteksi format berdasarkan nama file saja."""
+    base = Path(filename).name.lower()
+
+    cms_keys = [
+        "2024", "cms"     
+    ]
+    est_keys = [
+        "2025", "e-statement"
+    ]
+
+    if any(k in base for k in cms_keys):
+        return "CMS"
+    if any(k in base for k in est_keys):
+        return "E_STATEMENT"
+
+    # Heuristik tahun (kalau penamaan kamu konsisten)
+    if re.search(r"\b2025\b", base):
+        return "E_STATEMENT"
+    if re.search(r"\b2024\b", base):
+        return "CMS"
+
+    # Default jika tak terdeteksi
+    return "E_STATEMENT"
+
+# Penanda di halaman pertama; cukup satu scan per pola, tidak perlu decode seluruh dokumen
+CMS_MARKERS = [
+    re.compile(r'OPENING\s+BALANCE\s+TOTAL\s+DEBET', re.IGNORECASE),
+    re.compile(r'Account\s+Name', re.IGNORECASE),
+    re.compile(r'Today\s+Hold', re.IGNORECASE),
+]
+E_STATEMENT_MARKERS = [
+    re.compile(r'Kepada\s+Yth\.\s*/\s*To', re.IGNORECASE),
+    re.compile(r'No\.\s*Rekening', re.IGNORECASE),
+    re.compile(r'Periode\s+Transaksi', re.IGNORECASE),
+    re.compile(r'Tanggal\s+Laporan', re.IGNORECASE),
+]
+ROW_START = re.compile(r'^\d{2}/\d{2}/\d{2}\s+\d{2}:\d{2}:\d{2}\s')
+CMS_TELLER_IDS = {'CMSPYRL', 'BRI0372', 'BRIMDBT'}
+
+def _teller_id_last(first_page_text: str) -> Optional[bool]:
+    """Bentuk baris transaksi pertama: CMS menaruh teller ID di kolom terakhir,
+    e-statement menaruhnya sebelum debit/kredit/saldo. None kalau belum ada baris."""
+    for line in first_page_text.split('\n'):
+        line = line.strip()
+        if not ROW_START.match(line):
+            continue
+        last = line.rsplit(None, 1)[-1]
+        return bool(re.fullmatch(r'\d{7}', last)) or last in CMS_TELLER_IDS
+    return None
+
+def sniff_cms(first_page_text: str) -> int:
+    score = sum(1 for p in CMS_MARKERS if p.search(first_page_text))
+    return score + (_teller_id_last(first_page_text) is True)
+
+def sniff_e_statement(first_page_text: str) -> int:
+    score = sum(1 for p in E_STATEMENT_MARKERS if p.search(first_page_text))
+    return score + (_teller_id_last(first_page_text) is False)
+
+def sniff_format(first_page_text: str) -> Optional[str]:
+    """Format terdaftar dengan skor sniff tertinggi; None kalau kosong atau seri."""
+    if not first_page_text:
+        return None
+    scores = sorted(((fmt.sniff(first_page_text), name) for name, fmt in FORMATS.items()), reverse=True)
+    if not scores or scores[0][0] <= 0:
+        return None
+    if len(scores) > 1 and scores[1][0] == scores[0][0]:
+        return None
+    return scores[0][1]
+
+def first_page_text(pages: List[str]) -> str:
+    return next((p for p in pages if p and p.strip()), "")
+
+# Blok rekening ada di awal dokumen dan ringkasan saldo e-statement di halaman terakhir,
+# jadi pola header cukup dijalankan di potongan ini, bukan di seluruh teks
+HEADER_REGION_CHARS = 8192
+CMS_REQUIRED_FIELDS = ("Account Name", "Account Number")
+E_STATEMENT_REQUIRED_FIELDS = ("Account Name", "Account Number")
+
+def _cut_at_line(text: str, max_chars: int, from_end: bool = False) -> str:
+    if len(text) <= max_chars:
+        return text
+    if from_end:
+        cut = text.find('\n', len(text) - max_chars)
+        return text[cut + 1:] if cut != -1 else text[-max_chars:]
+    cut = text.rfind('\n', 0, max_chars)
+    return text[:cut + 1] if cut > 0 else text[:max_chars]
+
+def header_region(pages: List[str], max_chars: int = HEADER_REGION_CHARS) -> str:
+    """Maks. max_chars awal dokumen + maks. max_chars akhir halaman terakhir."""
+    head, size, used = [], 0, 0
+    for used, page_text in enumerate(pages, 1):
+        if page_text:
+            head.append(page_text)
+            size += len(page_text) + 1
+        if size >= max_chars:
+            break
+    region = _cut_at_line(join_pages(head), max_chars)
+
+    last = next((p for p in reversed(pages[used:]) if p), "")
+    if last:
+        region += _cut_at_line(last, max_chars, from_end=True) + "\n"
+    return region
+
+def _missing_fields(info: Dict, fields) -> bool:
+    return any(not info.get(f) for f in fields)
+
+# ============== BRI 2024 Format ==============
+
+# Pola header ditulis tanpa quantifier yang saling tumpang tindih (mis. \s*\n*\s* atau
+# \s*:?\s*) dan span lazy hanya berhenti setelah karakter non-spasi, supaya waktu
+# pencocokan tetap linear walau anchor tidak ada (lihat benchmarks/bench_regex_fuzz.py)
+_HDR = re.IGNORECASE | re.DOTALL
+_COLON = r'\s*(?::\s*)?'           # == \s*:?\s*
+_NAME_SPAN = r'[A-Z](?:\s*[A-Z&\.])*?'
+
+CMS_ACCOUNT_NO_PATTERNS = [
+    re.compile(r'Account\s+No' + _COLON + r'(\d{4}-\d{2}-\d{6}-\d{2}-\d)', _HDR),
+    re.compile(r'Account\s+No' + _COLON + r'(\d+)', _HDR),
+]
+CMS_ACCOUNT_NAME_PATTERNS = [
+    re.compile(r'Account\s+Name' + _COLON + r'(' + _NAME_SPAN + r')(?=\s*Today\s*Hold|\s*Period|\s*Account\s*Status)', _HDR),
+    re.compile(r'Account\s+Name' + _COLON + r'(' + _NAME_SPAN + r')(?=\s*Today|\s*Period|\s*Account\s*Status)', _HDR),
+    re.compile(r'Account\s+Name\s+(' + _NAME_SPAN + r')(?=\s*Today|\s*Period|\s*Account\s*Status)', _HDR),
+    re.compile(r'Account\s+Name' + _COLON + r'(PT\s+[A-Z\s]+)', _HDR),
+    re.compile(r'Account\s+Name' + _COLON + r'([A-Z][A-Z\s&\.PT]+)', _HDR),
+    re.compile(r'Account\s+Name' + _COLON + r'([A-Z&\.](?:\s*[A-Z&\.])*?)(?=\s*\n|\s*Today|\s*Period|\s*Account)', _HDR),
+]
+CMS_PERIOD_PATTERNS = [
+    re.compile(r'Period' + _COLON + r'(\d{2}/\d{2}/\d{4})\s*-\s*(\d{2}/\d{2}/\d{4})', _HDR),
+]
+PERIOD_RANGE = re.compile(r'(\d{2}/\d{2}/\d{4})\s*-\s*(\d{2}/\d{2}/\d{4})')
+
+def extract_cms_account_info(text):
+    account_info = {
+        "Bank": "BRI",
+        "Account Name": None,
+        "Account Number": None,
+        "Start Period": None,
+        "End Period": None,
+    }
+
+    # Account No
+    for p in CMS_ACCOUNT_NO_PATTERNS:
+        m = p.search(text)
+        if m:
+            account_info["Account Number"] = m.group(1).strip()
+            break
+
+    # Account Name
+    for p in CMS_ACCOUNT_NAME_PATTERNS:
+        m = p.search(text)
+        if m:
+            account_info["Account Name"] = m.group(1).strip()
+            break
+
+    # Period
+    for p in CMS_PERIOD_PATTERNS:
+        m = p.search(text)
+        if m:
+            account_info['Start Period'] = m.group(1)
+            account_info['End Period'] = m.group(2)
+            break
+
+    # Fallback berbasis baris
+    if not account_info.get("Account Name") or not account_info.get("Account Number"):
+        lines = text.split('\n')
+        for i, line in enumerate(lines):
+            s = line.strip()
+            if 'Account No' in s and ':' in s:
+                parts = s.split(':', 1)
+                account_info['Account Number'] = parts[1].strip()
+            elif 'Account Name' in s and ':' in s:
+                parts = s.split(':', 1)
+                account_info['Account Name'] = parts[1].strip()
+            elif 'Period' in s and ':' in s:
+                parts = s.split(':', 1)
+                m = PERIOD_RANGE.search(parts[1])
+                if m:
+                    account_info['Start Period'] = m.group(1)
+                    account_info['End Period'] = m.group(2)
+    return account_info
+
+# Satu pola ter-compile untuk satu baris CMS:
+# tanggal, jam, remark (boleh kosong), lalu debit, kredit, saldo, teller ID di ujung baris.
+# Remark wajib diawali & diakhiri non-spasi supaya tidak berebut spasi dengan \s+ di sekitarnya
+_CMS_TOKEN = r'([\d,\.]+|CMSPYRL|BRI0372|BRIMDBT)'
+CMS_ROW = re.compile(
+    r'(\d{2}/\d{2}/\d{2})\s+(\d{2}:\d{2}:\d{2})\s+(?:(\S(?:.*?\S)?)\s+)??'
+    + r'\s+'.join([_CMS_TOKEN] * 4) + r'$'
+)
+
+def _squash_spaces(text: str) -> str:
+    if '  ' in text or '\t' in text:
+        return ' '.join(text.split())
+    return text
+
+def extract_cms_transactions(text: Union[str, Iterable[str]], integer_cents: bool = False) -> Columns:
+    dates, remarks = [], []
+    raw_debit, raw_credit, raw_ledger = [], [], []
+    row_match = CMS_ROW.match
+    for line in iter_text_lines(text):
+        m = row_match(line.strip())
+        if m is None:
+            continue
+        date, _time, remark, debet_str, credit_str, ledger_str, _teller_id = m.groups()
+        dates.append(date)
+        remarks.append(_squash_spaces(remark) if remark else "")
+        raw_debit.append(debet_str)
+        raw_credit.append(credit_str)
+        raw_ledger.append(ledger_str)
+
+    return {
+        'Date': dates,
+        'Remark': remarks,
+        **_amount_columns({'Debit': raw_debit, 'Credit': raw_credit, 'Saldo': raw_ledger}, integer_cents),
+    }
+
+# [^\S\n]*\n\s* == \s*\n\s* tanpa ambiguitas di deretan baris kosong
+CMS_SUMMARY_PATTERN = re.compile(
+    r'OPENING\s+BALANCE\s+TOTAL\s+DEBET\s+TOTAL\s+CREDIT\s+CLOSING\s+BALANCE[^\S\n]*\n'
+    r'\s*([\d,\.]+)\s+([\d,\.]+)\s+([\d,\.]+)\s+([\d,\.]+)',
+    re.IGNORECASE | re.MULTILINE
+)
+
+def extract_cms_summary(text):
+    summary = {}
+    m = CMS_SUMMARY_PATTERN.search(text)
+    if m:
+        try:
+            summary['Saldo Awal']     = clean_amount(m.group(1))
+            summary['Mutasi Debit']   = clean_amount(m.group(2))
+            summary['Mutasi Credit']  = clean_amount(m.group(3))
+            summary['Saldo Akhir']    = clean_amount(m.group(4))
+        except:
+            pass
+    return summary
+
+# ============== BRI E-Statement (umum 2025) ==============
+
+_LINE_BREAK = r'[^\S\n]*\n\s*'     # == \s*\n\s*
+_KEPADA = r'Kepada\s+Yth\.\s*/\s*To\s*:' + _LINE_BREAK
+_UNIT_END = r'(?=\s*(?:Alamat\s+Unit|Business\s+Unit\s+Address|\n|$))'
+_UNIT_ADDRESS = r'(?:Alamat\s+Unit\s+Kerja|Business\s+Unit\s+Address)'
+_UNIT_ADDRESS_LINE = r'([A-Z](?:[A-Z]|[^\S\n])*?)\n\s*([A-Z][A-Z\s]*?)(?=\n|$)'
+
+# Pola nama pertama lama: sapaan, baris nama, lalu \s*(.*?) sampai NAMA_BLOCK_END. Dipecah
+# menjadi awal + pencarian akhir (lihat _search_nama_block) supaya tetap linear tanpa
+# mengubah hasil, termasuk capture kosong
+NAMA_BLOCK_START = re.compile(_KEPADA + r'[A-Z](?:[A-Z]|[^\S\n])*?\n(\s*)', _HDR)
+NAMA_BLOCK_END = re.compile(r'\n\n|\nNo\.\s*Rekening|\nTanggal\s+Laporan|\nPeriode\s+Transaksi|\nNo\s+Rekening',
+                            re.IGNORECASE)
+# Dicoba kalau NAMA_BLOCK_START tidak menghasilkan apa-apa
+NAMA_PATTERNS = [
+    re.compile(_KEPADA + r'(\S[^\n]*)(?:\n[^\n]*?)*?(?=\n[^\S\n]*No\.\s*Rekening|\n[^\S\n]*Tanggal\s+Laporan|\n[^\S\n]*Account\s+No)', _HDR),
+    re.compile(_KEPADA + r'(\S.*?)(?=\n[^\S\n]*No\.\s*Rekening)', _HDR),
+]
+def _search_nama_block(text: str) -> Optional[str]:
+    """Capture pola nama pertama, None kalau tidak cocok.
+
+    Capture berakhir di NAMA_BLOCK_END pertama setelah deretan spasi sesudah baris nama.
+    Kalau tidak ada, pola lama mundur ke dalam deretan spasi itu: NAMA_BLOCK_END di sana
+    menghasilkan capture kosong (nama tetap None, pola lain tidak dicoba).
+    """
+    end_found = True
+    for start in NAMA_BLOCK_START.finditer(text):
+        if end_found:
+            end = NAMA_BLOCK_END.search(text, start.end())
+            if end:
+                return text[start.end():end.start()]
+            end_found = False  # sapaan berikutnya ada di kanan, jadi juga tidak punya akhir
+        for pos in range(start.start(1), start.end()):
+            if text[pos] == '\n' and NAMA_BLOCK_END.match(text, pos):
+                return ""
+    return None
+
+def _search_nama(text: str) -> Optional[str]:
+    nama_text = _search_nama_block(text)
+    if nama_text is not None:
+        return nama_text
+    for pattern in NAMA_PATTERNS:
+        nama_match = pattern.search(text)
+        if nama_match:
+            return nama_match.group(1)
+    return None
+
+NAMA_PERIODE_SUFFIX = re.compile(r'(?<!\s)\s+Periode\s+Transaksi.*', re.IGNORECASE)
+TANGGAL_PATTERNS = [
+    re.compile(r'Tanggal\s+Laporan[:\s]*(\d{2}/\d{2}/\d{2,4})', re.IGNORECASE),
+    re.compile(r'Statement\s+Date[:\s]*(\d{2}/\d{2}/\d{2,4})', re.IGNORECASE),
+]
+PERIODE_PATTERNS = [
+    re.compile(r'Periode\s+Transaksi[:\s]*(\d{2}/\d{2}/\d{2,4})\s*-\s*(\d{2}/\d{2}/\d{2,4})', re.IGNORECASE),
+    re.compile(r'Transaction\s+Period[:\s]*(\d{2}/\d{2}/\d{2,4})\s*-\s*(\d{2}/\d{2}/\d{2,4})', re.IGNORECASE),
+]
+REKENING_PATTERNS = [
+    re.compile(r'No\.\s*Rekening\s*Account\s*No\s*(?:[,:]+\s*)?(\d+)', re.IGNORECASE),
+    re.compile(r'No\.\s*Rekening[:\s]*(\d+)', re.IGNORECASE),
+    re.compile(r'Account\s*No[:\s]*(\d+)', re.IGNORECASE),
+]
+PRODUK_PATTERNS = [
+    re.compile(r'(?:Nama\s+Produk|Product\s+Name)\s*(?:[,:]+\s*)?((?:\s*\S)*?)(?=\s*(?:Unit\s*Kerja|Business\s*Unit|Valuta|Currency|Alamat\s*Unit\s*Kerja|\n|$))', _HDR),
+]
+VALUTA_PATTERNS = [
+    re.compile(r'Valuta\s*Currency\s*(?:[,:]+\s*)?([A-Z]+)', re.IGNORECASE),
+    re.compile(r'Valuta[:\s]*([A-Z]+)', re.IGNORECASE),
+    re.compile(r'Currency[:\s]*([A-Z]+)', re.IGNORECASE),
+]
+UNIT_PATTERNS = [
+    re.compile(r'Unit\s+Kerja\s*Business\s+Unit\s*(?:[,:]+\s*)?([A-Z](?:\s*[A-Z])*?)' + _UNIT_END, re.IGNORECASE),
+    re.compile(r'Unit\s+Kerja[:\s]*([A-Z](?:\s*[A-Z])*?)' + _UNIT_END, re.IGNORECASE),
+    re.compile(r'Business\s+Unit[:\s]*([A-Z](?:\s*[A-Z])*?)' + _UNIT_END, re.IGNORECASE),
+]
+ALAMAT_UNIT_KERJA_PATTERNS = [
+    re.compile(_UNIT_ADDRESS + r'(?:\s*[,:]+)?' + _LINE_BREAK + _UNIT_ADDRESS_LINE, _HDR),
+    re.compile(_UNIT_ADDRESS + r'\s*(?:[,:]+\s*)?' + _UNIT_ADDRESS_LINE, _HDR),
+    re.compile(_UNIT_ADDRESS + r'\s*(?:[,:]+\s*)?([A-Z][A-Z\s]*?)(?=\n|$)', _HDR),
+]
+BALANCE_SUMMARY_PATTERN = re.compile(
+    r'(?:Saldo Awal|Opening Balance)\s*'
+    r'(?:Opening Balance\s*)?'
+    r'(?:Total Transaksi Debet|Total Debit Transaction)\s*'
+    r'(?:Total Debit Transaction\s*)?'
+    r'(?:Total Transaksi Kredit|Total Credit Transaction)\s*'
+    r'(?:Total Credit Transaction\s*)?'
+    r'(?:Saldo Akhir|Closing Balance)\s*'
+    r'(?:Closing Balance\s*)?'
+    r'([\d,\.]+\s+[\d,\.]+\s+[\d,\.]+\s+[\d,\.]+)',
+    _HDR
+)
+
+def extract_estatement_header(text):
+    personal_info = {
+        "Bank": "BRI",
+        "Account Name": None,
+        "Account Number": None,
+        "Address": None,
+        "Report Date": None,
+        "Branch": None,
+        "Business Unit Address": None,
+        "Product Name": None,
+        "Currency": None,
+        "Period": None,
+        "Start Period": None,
+        "End Period": None
+    }
+
+    nama_text = _search_nama(text)
+    if nama_text is not None:
+        extracted_text = nama_text.strip()
+        lines = [line.strip() for line in extracted_text.split('\n') if line.strip()]
+
+        if lines:
+            # personal_info['Account Name'] = lines[0]
+            nama_clean = lines[0]
+            nama_clean = NAMA_PERIODE_SUFFIX.sub('', nama_clean).strip()
+            personal_info['Account Name'] = nama_clean
+
+            if len(lines) > 1:
+                alamat_lines = lines[1:]
+                alamat_filtered = []
+                for line in alamat_lines:
+                  if not re.match(r'\d{2}/\d{2}/\d{2,4}', line) and 'Periode Transaksi' not in line:
+                    alamat_filtered.append(line)
+                if alamat_filtered:
+                  alamat_valid = []
+                  for line in alamat_filtered:
+                    if 'Transaction Period' not in line:
+                      alamat_valid.append(line)
+
+                  if alamat_valid:
+                      alamat_cleaned = ' '.join(alamat_valid)
+                      alamat_cleaned = re.sub(r'\s+', ' ', alamat_cleaned)
+                      personal_info['Address'] = alamat_cleaned
+
+    if 'Account Name' not in personal_info:
+        simple_nama_pattern = r'Kepada\s+Yth\.\s*/\s*To\s*:\s*\n\s*([A-Z][A-Z\s]+)'
+        simple_match = re.search(simple_nama_pattern, text, re.IGNORECASE)
+        if simple_match:
+            personal_info['nama'] = simple_match.group(1).strip()
+
+    # Tanggal laporan
+    for pattern in TANGGAL_PATTERNS:
+        tanggal_match = pattern.search(text)
+        if tanggal_match:
+            personal_info['Report Date'] = tanggal_match.group(1)
+            break
+
+    # Ekstrak periode transaksi dengan error handling
+    for pattern in PERIODE_PATTERNS:
+        periode_match = pattern.search(text)
+        if periode_match:
+            personal_info['Start Period'] = periode_match.group(1)
+            personal_info['End Period'] = periode_match.group(2)
+            break
+
+    # Ekstrak nomor rekening dengan error handling
+    for pattern in REKENING_PATTERNS:
+        rekening_match = pattern.search(text)
+        if rekening_match:
+            personal_info['Account Number'] = rekening_match.group(1)
+            break
+
+    # Ekstrak nama produk dengan error handling
+    for pattern in PRODUK_PATTERNS:
+        produk_match = pattern.search(text)
+        if produk_match:
+            personal_info['Product Name'] = produk_match.group(1).strip()
+            break
+
+    # Ekstrak valuta dengan error handling
+    for pattern in VALUTA_PATTERNS:
+        valuta_match = pattern.search(text)
+        if valuta_match:
+            personal_info['Currency'] = valuta_match.group(1).strip()
+            break
+
+    # Ekstrak unit kerja dengan error handling
+    for pattern in UNIT_PATTERNS:
+        unit_match = pattern.search(text)
+        if unit_match:
+            personal_info['Branch'] = unit_match.group(1).strip()
+            break
+
+    # Ekstrak alamat unit kerja dengan error handling
+    for pattern in ALAMAT_UNIT_KERJA_PATTERNS:
+        alamat_unit_match = pattern.search(text)
+        if alamat_unit_match:
+            if len(alamat_unit_match.groups()) >= 2:
+                alamat_temp = f"{alamat_unit_match.group(1).strip()} {alamat_unit_match.group(2).strip()}"
+            else:
+                alamat_temp = alamat_unit_match.group(1).strip()
+
+            alamat_temp = re.sub(r'Product\s+Name\s*Business\s+Unit\s*Address ', '', alamat_temp, flags=re.IGNORECASE).strip()
+            personal_info['Business Unit Address'] = alamat_temp
+            break
+
+    return personal_info
+
+def extract_estatement_summary(text):
+    # --- Ekstraksi Informasi Finansial (Saldo) dengan error handling ---
+    financial_summary = {}
+
+    try:
+        financial_match = BALANCE_SUMMARY_PATTERN.search(text)
+        if financial_match:
+            amounts_line = financial_match.group(1).strip()
+            amounts = amounts_line.split()
+
+            def parse_amount(amount_str):
+                try:
+                    amount_str = amount_str.strip()
+                    if ',' in amount_str and amount_str.rfind(',') > amount_str.rfind('.'):
+                        amount_str = amount_str.replace('.', '')
+                        amount_str = amount_str.replace(',', '.')
+                    elif ',' in amount_str:
+                        amount_str = amount_str.replace(',', '')
+                    elif amount_str.count('.') > 1:
+                        parts = amount_str.rsplit('.', 1)
+                        integer_part = parts[0].replace('.', '')
+                        if len(parts) > 1:
+                            decimal_part = parts[1]
+                            amount_str = f"{integer_part}.{decimal_part}"
+                        else:
+                            amount_str = integer_part
+                    return float(amount_str)
+                except:
+                    return 0.0
+
+            if len(amounts) >= 4:
+                financial_summary['opening_balance'] = parse_amount(amounts[0])
+                financial_summary['total_debit_transaction'] = parse_amount(amounts[1])
+                financial_summary['total_credit_transaction'] = parse_amount(amounts[2])
+                financial_summary['closing_balance'] = parse_amount(amounts[3])
+
+    except Exception as e:
+        logger.warning("Error extracting financial summary: %s", e)
+
+    return financial_summary
+
+def extract_personal_info(text):
+    return extract_estatement_header(text), extract_estatement_summary(text)
+
+def extract_transactions(text: Union[str, Iterable[str]], integer_cents: bool = False) -> Columns:
+    """Extract semua transaksi dari bank statement"""
+    dates, times, descriptions, teller_ids = [], [], [], []
+    raw_debit, raw_credit, raw_balance = [], [], []
+
+    # Pattern untuk menangkap transaksi
+    # Format: DD/MM/YY HH:MM:SS Description TellerID Debit Credit Balance
+    transaction_pattern = r'(\d{2}/\d{2}/\d{2})\s+(\d{2}:\d{2}:\d{2})\s+(.+?)\s+(\d{7})\s+([\d,\.]+)\s+([\d,\.]+)\s+([\d,\.]+)'
+
+    for line in iter_text_lines(text):
+        line = line.strip()
+        if not line:
+            continue
+
+        # Cek apakah baris dimulai dengan tanggal
+        if re.match(r'^\d{2}/\d{2}/\d{2}\s+\d{2}:\d{2}:\d{2}', line):
+            # Split berdasarkan spasi, tapi hati-hati dengan deskripsi yang panjang
+            parts = line.split()
+            if len(parts) >= 7:
+                try:
+                    date = parts[0]
+                    time = parts[1]
+                    teller_id = None
+
+                    # Cari teller ID (7 digit number), debit, credit, balance dari akhir
+                    # Ambil 4 elemen terakhir
+                    numeric_parts = []
+                    for i in range(len(parts) - 1, -1, -1):
+                        if re.match(r'^[\d,\.]+$', parts[i]) or re.match(r'^\d{7}$', parts[i]):
+                            numeric_parts.insert(0, parts[i])
+                            if len(numeric_parts) == 4:
+                                break
+
+                    if len(numeric_parts) == 4:
+                        teller_id = numeric_parts[0]
+
+                        # Description adalah sisa parts setelah date, time dan sebelum 4 numeric parts terakhir
+                        desc_start = 2  # setelah date dan time
+                        desc_end = len(parts) - 4  # sebelum 4 numeric parts
+                        description = ' '.join(parts[desc_start:desc_end])
+
+                        dates.append(date)
+                        times.append(time)
+                        descriptions.append(description.strip())
+                        teller_ids.append(teller_id)
+                        # Nominal di-parse sekaligus per kolom setelah loop
+                        raw_debit.append(numeric_parts[1])
+                        raw_credit.append(numeric_parts[2])
+                        raw_balance.append(numeric_parts[3])
+
+                except (ValueError, IndexError) as e:
+                    # Skip baris yang tidak bisa diparse
+                    continue
+
+    return {
+        'tanggal': dates,
+        'waktu': times,
+        'deskripsi': descriptions,
+        'teller_id': teller_ids,
+        **_amount_columns({'debit': raw_debit, 'kredit': raw_credit, 'saldo': raw_balance}, integer_cents),
+    }
+
+# ============== Partner Extraction & Analytics ==============
+
+# Deskripsi yang mengandung salah satu keyword ini bukan transaksi dengan partner
+SKIP_KEYWORDS = (
+    "BIAYA", "ADM", "BUNGA", "PAJAK", "KLIRING", "TARIK TUNAI",
+    "SETORAN", "BI-FAST", "BPJS", "TAX", "INTEREST",
+    "FEE", "SINGLE CN", "POLLING", "REWARD", "CLAIM", "BPJS TK", "BPJS KESEHATAN",
+)
+# Satu scan untuk semua keyword (search menemukan kemunculan mana pun), bukan 18x `in`
+SKIP_KEYWORD_PATTERN = re.compile("|".join(re.escape(k) for k in sorted(SKIP_KEYWORDS, key=len, reverse=True)))
+
+TRANSFER_TO_PATTERN = re.compile(r'(?:TRF|TRANSFER)\s+(?:KE|TO)\s+([A-Z\s\.\-&]{3,})')
+BM_CODE = re.compile(r'BM\d+')
+BM_LINE = re.compile(r'^BM\d+\s+\d+\s+\d+')
+BM_LINE_NAME = re.compile(r'BM\d+\s+\d+\s+\d+\s+(.+)')
+NBMB_PATTERN = re.compile(r'NBMB\s+(.*?)\s+TO\s+(.*?)(?:\n|ESB:|$)', re.IGNORECASE | re.DOTALL)
+WBNKTRF_CODE = re.compile(r'WBNKTRF\w+', re.IGNORECASE)
+BFST_CODE = re.compile(r'BFST\d+', re.IGNORECASE)
+ESB_TAIL = re.compile(r'ESB:.*', re.DOTALL)
+LONG_DIGITS_8 = re.compile(r'\d{8,}')
+FALLBACK_CODE = re.compile(r'\b[A-Z]{2,}\d+[A-Z]*\b')
+FALLBACK_LONG_NUMBER = re.compile(r'\b\d{5,}\b')
+FALLBACK_NON_NAME = re.compile(r'[^A-Za-z\s&\.-]')
+WHITESPACE_RUN = re.compile(r'\s+')
+FALLBACK_STOPWORDS = frozenset({
+    "TRANSFER","TRF","KE","TO","BAYAR","PEMBAYARAN","PENERIMA","PENGIRIM",
+    "VIA","BANK","BRI","PT","CV","QRIS","BRIVA","VA","BIFAST","BI","FAST",
+    "RTGS","LLG","KLIRING","ADM","PAJAK","BUNGA","FEE","SETOR","SETORAN",
+})
+
+def _match_partner_rule(description: str) -> Tuple[Optional[str], str]:
+    """(nama partner, nama aturan yang menentukan hasil) untuk satu deskripsi."""
+    if not description or (isinstance(description, float) and pd.isna(description)):
+        return None, "empty"
+
+    # Huruf besar sekali saja; semua cek keyword aturan di bawah memakai string ini
+    cleaned = str(description).strip()
+    upper = cleaned.upper()
+    if SKIP_KEYWORD_PATTERN.search(upper):
+        return None, "skip_keyword"
+
+    # Pola umum TRF/TRANSFER KE/TO
+    if "TRF" in upper or "TRANSFER" in upper:
+        m = TRANSFER_TO_PATTERN.search(upper)
+        if m:
+            name = re.sub(r'\s{2,}', ' ', m.group(1).title().strip())
+            if len(name) >= 3:
+                return name, "transfer"
+
+    # BM
+    if "BM" in cleaned and BM_CODE.search(cleaned):
+        lines = [ln.strip() for ln in cleaned.split('\n') if ln.strip()]
+        words = []
+        esb_found = False
+        for ln in lines:
+            if ln.startswith('ESB:'):
+                esb_found = True
+                continue
+            if BM_LINE.match(ln):
+                mm = BM_LINE_NAME.search(ln)
+                if mm:
+                    words += [w for w in mm.group(1).split() if w.isalpha() and len(w) >= 2]
+            else:
+                if not esb_found:
+                    words += [w for w in ln.split() if w.isalpha() and len(w) >= 2]
+        if words:
+            return ' '.join(words), "bm"
+
+    # NBMB
+    if "NBMB" in upper:
+        mm = NBMB_PATTERN.search(cleaned)
+        if mm:
+            receiver = mm.group(2).strip()
+            sender   = mm.group(1).strip()
+            return (receiver if receiver else sender), "nbmb"
+
+    # WBNKTRF
+    if "WBNKTRF" in upper:
+        after = WBNKTRF_CODE.sub('', cleaned)
+        after = ESB_TAIL.sub('', after)
+        words = [w for w in after.split() if w.isalpha() and len(w) >= 2]
+        if words:
+            return ' '.join(words), "wbnktrf"
+
+    # BFST
+    if "BFST" in upper:
+        cnt = BFST_CODE.sub('', cleaned)
+        cnt = ESB_TAIL.sub('', cnt)
+        cnt = LONG_DIGITS_8.sub('', cnt)
+        if ':' in cnt:
+            for part in cnt.split(':'):
+                nm = ''.join(c for c in part if c.isalpha() or c.isspace()).strip()
+                if nm and len(nm) >= 3:
+                    return nm, "bfst"
+        else:
+            words = [w for w in cnt.split() if w.isalpha() and len(w) >= 2]
+            if words:
+                return ' '.join(words), "bfst"
+
+    # IBIZ
+    if "IBIZ" in upper and " TO " in upper:
+        parts = cleaned.split(" TO ")
+        if len(parts) > 1:
+            receiver_part = parts[1].split("ESB:")[0].strip()
+            words = [w for w in receiver_part.split() if w.isalpha() and len(w) >= 2]
+            if words:
+                return ' '.join(words[:4]), "ibiz"
+
+    # Payroll
+    if "PAYROLL" in upper:
+        return "PAYROLL", "payroll"
+
+    # Setoran penjualan
+    if "SETOR" in upper and "PENJUALAN" in upper:
+        return "PENJUALAN INTERNAL", "setor_penjualan"
+
+    # --- Fallback umum: ambil kandidat nama dari teks yang dibersihkan ---
+    cleaned_up = ESB_TAIL.sub(' ', cleaned)
+    cleaned_up = FALLBACK_CODE.sub(' ', cleaned_up)          # kode seperti BFST123
+    cleaned_up = FALLBACK_LONG_NUMBER.sub(' ', cleaned_up)   # angka panjang
+    cleaned_up = FALLBACK_NON_NAME.sub(' ', cleaned_up)
+    cleaned_up = WHITESPACE_RUN.sub(' ', cleaned_up).strip()
+
+    words = [w for w in cleaned_up.upper().split() if w not in FALLBACK_STOPWORDS and len(w) >= 3]
+    if words:
+        cand = ' '.join(words[:6]).title()
+        if len(cand) >= 3:
+            return cand, "fallback"
+
+    return None, "no_match"
+
+def extract_partner_name_bri(description: str):
+    return _match_partner_rule(description)[0]
+
+# Deskripsi yang sama (payroll, biaya, partner rutin) berulang antar statement dalam satu proses
+PARTNER_CACHE_SIZE = 65536
+_partner_stats = {"rows": 0, "unique_descriptions": 0, "rule_hits": Counter()}
+
+@lru_cache(maxsize=PARTNER_CACHE_SIZE)
+def _cached_partner_name(description):
+    return _match_partner_rule(description)
+
+def extract_partner_names(descriptions: pd.Series) -> pd.Series:
+    """extract_partner_name_bri untuk satu kolom: dedup dulu, ekstrak yang unik saja, lalu map balik."""
+    codes, uniques = pd.factorize(descriptions)  # NaN/None -> code -1
+    # Indeks 0 untuk NaN/None, jadi semua kode digeser +1
+    matches = [(None, "empty")] + [_cached_partner_name(d) for d in uniques]
+    names = np.array([name for name, _ in matches], dtype=object)
+    # Hit per aturan dihitung per baris, bukan per deskripsi unik
+    counts = np.bincount(codes + 1, minlength=len(matches)).tolist()
+    for (_, rule), n in zip(matches, counts):
+        if n:
+            _partner_stats["rule_hits"][rule] += n
+    _partner_stats["rows"] += len(descriptions)
+    _partner_stats["unique_descriptions"] += len(uniques)
+    return pd.Series(names[codes + 1], index=descriptions.index, dtype=object)
+
+def partner_cache_stats() -> Dict:
+    info = _cached_partner_name.cache_info()
+    rows = _partner_stats["rows"]
+    return {
+        "rows": rows,
+        "unique_descriptions": _partner_stats["unique_descriptions"],
+        "lru_hits": info.hits,
+        "lru_misses": info.misses,
+        "lru_size": info.currsize,
+        # Porsi baris yang tidak perlu menjalankan extract_partner_name_bri
+        "hit_ratio": (1 - info.misses / rows) if rows else 0.0,
+        "rule_hits": dict(_partner_stats["rule_hits"]),
+    }
+
+def clear_partner_cache() -> None:
+    _cached_partner_name.cache_clear()
+    _partner_stats.update(rows=0, unique_descriptions=0, rule_hits=Counter())
+
+# Urutan kategori alfabetis supaya groupby/sort menghasilkan urutan yang sama dengan string biasa
+TRANSACTION_TYPE_DTYPE = pd.CategoricalDtype(['CREDIT', 'DEBIT', 'UNKNOWN'])
+
+def classify_transaction_type(debit: pd.Series, credit: pd.Series) -> pd.Categorical:
+    """DEBIT kalau debit > 0, CREDIT kalau kredit > 0, selain itu UNKNOWN."""
+    codes = np.select([debit.to_numpy() > 0, credit.to_numpy() > 0], [1, 0], default=2)
+    return pd.Categorical.from_codes(codes, dtype=TRANSACTION_TYPE_DTYPE)
+
+def detect_bri_format(transactions_df):
+    if 'Remark' in transactions_df.columns: return 'CMS'
+    if 'deskripsi' in transactions_df.columns: return 'E_STATEMENT'
+    return 'UNKNOWN'
+
+def analyze_bri_partners_unified(transactions_df):
+    if transactions_df.empty:
+        return transactions_df, pd.DataFrame()
+
+    fmt = detect_bri_format(transactions_df)
+    df = transactions_df.copy()
+
+    if fmt == 'CMS':
+        desc_col, debit_col, credit_col = 'Remark', 'Debit', 'Credit'
+    elif fmt == 'E_STATEMENT':
+        desc_col, debit_col, credit_col = 'deskripsi', 'debit', 'kredit'
+    else:
+        return df, pd.DataFrame()
+
+    df['partner_name'] = extract_partner_names(df[desc_col])
+    df['transaction_type'] = classify_transaction_type(df[debit_col], df[credit_col])
+    df['amount'] = df[debit_col] + df[credit_col]
+
+    partner_transactions = df[df['partner_name'].notna()].copy()
+    if partner_transactions.empty:
+        return df, pd.DataFrame()
+
+    partner_summary = partner_transactions.groupby(['partner_name', 'transaction_type'], observed=True).agg({
+        debit_col: 'sum',
+        credit_col: 'sum',
+        'amount': 'sum',
+        desc_col: 'count'
+    }).rename(columns={desc_col: 'transaction_count'}).reset_index().sort_values('amount', ascending=False)
+
+    partner_summary_table = create_partner_summary_table(df)
+    return partner_summary, partner_summary_table  # ringkasan per partner/tipe + tabel ringkas
+
+def create_partner_summary_table(partner_df):
+    if partner_df.empty or 'partner_name' not in partner_df.columns:
+        return pd.DataFrame()
+    partner_transactions = partner_df[partner_df['partner_name'].notna()].copy()
+    if partner_transactions.empty:
+        return pd.DataFrame()
+
+    if {'Debit','Credit'}.issubset(partner_transactions.columns):
+        debit_col, credit_col = 'Debit', 'Credit'
+    elif {'debit','kredit'}.issubset(partner_transactions.columns):
+        debit_col, credit_col = 'debit', 'kredit'
+    else:
+        return pd.DataFrame()
+
+    # Satu groupby untuk semua partner; sort=False menjaga urutan kemunculan pertama
+    summary_df = partner_transactions.assign(
+        _credit_pos=partner_transactions[credit_col] > 0,
+        _debit_pos=partner_transactions[debit_col] > 0,
+    ).groupby('partner_name', sort=False).agg(
+        Total_Credit=(credit_col, 'sum'),
+        Total_Debit=(debit_col, 'sum'),
+        Credit_Count=('_credit_pos', 'sum'),
+        Debit_Count=('_debit_pos', 'sum'),
+        Total_Transactions=(credit_col, 'size'),
+    ).rename_axis('Partner').reset_index()
+    summary_df['Total_Volume'] = summary_df['Total_Credit'] + summary_df['Total_Debit']
+    summary_df = summary_df.sort_values('Total_Volume', ascending=False).drop(columns=['Total_Volume']).reset_index(drop=True)
+    return summary_df
+
+def create_partner_statistics_summary(df_for_stats):
+    # df_for_stats diharapkan punya kolom partner_name atau setidaknya debit/kredit
+    if df_for_stats.empty:
+        return pd.DataFrame()
+
+    if 'partner_name' in df_for_stats.columns:
+        partner_transactions = df_for_stats[df_for_stats['partner_name'].notna()].copy()
+    else:
+        partner_transactions = df_for_stats.copy()
+
+    if partner_transactions.empty:
+        return pd.DataFrame()
+
+    if {'Debit','Credit'}.issubset(partner_transactions.columns):
+        debit_col, credit_col = 'Debit', 'Credit'
+    elif {'debit','kredit'}.issubset(partner_transactions.columns):
+        debit_col, credit_col = 'debit', 'kredit'
+    else:
+        return pd.DataFrame()
+
+    total_credit_transactions = int((partner_transactions[credit_col] > 0).sum())
+    total_debit_transactions  = int((partner_transactions[debit_col]  > 0).sum())
+    # Tetap int sen kalau kolomnya int64, float kalau float64
+    total_credit_amount = _amount_scalar(partner_transactions[credit_col].sum())
+    total_debit_amount  = _amount_scalar(partner_transactions[debit_col].sum())
+    total_unique_partners = int(partner_transactions['partner_name'].nunique()) if 'partner_name' in partner_transactions.columns else 0
+
+    if 'partner_name' in partner_transactions.columns:
+        gp = partner_transactions.groupby('partner_name').agg({debit_col:'sum', credit_col:'sum'}).reset_index()
+        gp['total_volume'] = gp[debit_col] + gp[credit_col]
+        top_idx = gp['total_volume'].idxmax() if not gp.empty else None
+        top_partner_name = gp.at[top_idx, 'partner_name'] if top_idx is not None else None
+        top_partner_amount = _amount_scalar(gp['total_volume'].at[top_idx]) if top_idx is not None else 0.0
+    else:
+        top_partner_name, top_partner_amount = None, 0.0
+
+    return pd.DataFrame([{
+        'No_of_Credit': total_credit_transactions,
+        'No_of_Debit': total_debit_transactions,
+        'Total_Credit_Amount': total_credit_amount,
+        'Total_Debit_Amount': total_debit_amount,
+        'Total_Partners': total_unique_partners,
+        'Top_Partner': top_partner_name,
+        'Top_Partner_Amount': top_partner_amount
+    }])
+
+# ============== Format Registry ==============
+
+@dataclass(frozen=True)
+class StatementFormat:
+    """Satu layout rekening koran.
+
+    sniff dipanggil sekali per dokumen dengan teks halaman pertama dan harus murah;
+    extractor header/ringkasan menerima potongan header_region, parse_rows menerima
+    baris dokumen secara streaming (plus keyword integer_cents) dan mengembalikan
+    buffer per kolom.
+    """
+    name: str
+    sniff: Callable[[str], int]
+    extract_header: Callable[[str], Dict]
+    extract_summary: Callable[[str], Dict]
+    parse_rows: Callable[..., Columns]
+    required_fields: Tuple[str, ...] = ()
+
+FORMATS: Dict[str, StatementFormat] = {}
+
+def register_format(fmt: StatementFormat) -> StatementFormat:
+    """Daftarkan (atau ganti) format berdasarkan nama."""
+    FORMATS[fmt.name] = fmt
+    return fmt
+
+register_format(StatementFormat(
+    name="CMS",
+    sniff=sniff_cms,
+    extract_header=extract_cms_account_info,
+    extract_summary=extract_cms_summary,
+    parse_rows=extract_cms_transactions,
+    required_fields=CMS_REQUIRED_FIELDS,
+))
+register_format(StatementFormat(
+    name="E_STATEMENT",
+    sniff=sniff_e_statement,
+    extract_header=extract_estatement_header,
+    extract_summary=extract_estatement_summary,
+    parse_rows=extract_transactions,
+    required_fields=E_STATEMENT_REQUIRED_FIELDS,
+))
+
+# ============== Parser Orkestrasi (autodetect) ==============
+
+class ParseResult(tuple):
+    """Lima DataFrame hasil parse (di-unpack seperti tuple biasa) plus dict ``metrics``.
+
+    metrics: durasi per tahap (detik), halaman, baris dipindai / jadi transaksi / ditolak
+    parser baris, hit aturan & LRU partner, dan status cache.
+    """
+
+    def __new__(cls, tables, metrics: Optional[Dict] = None):
+        self = super().__new__(cls, tables)
+        self.metrics = metrics if metrics is not None else new_metrics()
+        return self
+
+    def __reduce__(self):
+        return ParseResult, (tuple(self), self.metrics)
+
+def new_metrics(filename: str = "") -> Dict:
+    return {
+        "filename": filename,
+        "format": None,
+        "cache": "off",  # off / miss / pages / result
+        "pages": 0,
+        "lines_scanned": 0,
+        "rows": 0,
+        "lines_rejected": 0,
+        "header_full_text_fallback": False,
+        "partner": {"lru_hits": 0, "lru_misses": 0, "rule_hits": {}},
+        "stages": {},
+    }
+
+@contextmanager
+def _timed(metrics: Dict, stage: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stages = metrics["stages"]
+        stages[stage] = stages.get(stage, 0.0) + time.perf_counter() - start
+
+def _counted(lines: Iterable[str], metrics: Dict) -> Iterator[str]:
+    for line in lines:
+        metrics["lines_scanned"] += 1
+        yield line
+
+def _log_metrics(metrics: Dict) -> None:
+    logger.info("parsed %s: format=%s rows=%d pages=%d cache=%s in %.3fs",
+                metrics["filename"], metrics["format"], metrics["rows"], metrics["pages"],
+                metrics["cache"], metrics["stages"].get("total", 0.0),
+                extra={"event": "parse_statement", "metrics": metrics})
+
+def parse_bri_statement(pdf_src, filename, cache: Optional[StatementCache] = None,
+                        pdf_workers: Optional[int] = None, integer_cents: bool = False,
+                        profile_dir: Optional[str] = None,
+                        header_chars: Optional[int] = HEADER_REGION_CHARS) -> ParseResult:
+    """integer_cents=True -> semua kolom di AMOUNT_COLUMNS berupa int64 sen, bukan float rupiah.
+
+    header_chars -> ukuran potongan awal/akhir dokumen untuk pola header & ringkasan
+    (lihat header_region); 0/None = seluruh teks.
+
+    profile_dir -> parse penuh di bawah cProfile + tracemalloc, hasilnya ditulis ke folder
+    itu dengan nama sha256 dokumen (lihat profile_statement).
+    """
+    metrics = new_metrics(filename)
+    if profile_dir is not None:
+        result = profile_statement(pdf_src, filename, Path(profile_dir), integer_cents, metrics,
+                                   header_chars=header_chars)
+    else:
+        with _timed(metrics, "total"):
+            result = _parse_statement(pdf_src, filename, cache, pdf_workers, integer_cents, header_chars,
+                                      metrics)
+    _log_metrics(metrics)
+    return result
+
+# ============== Profiling (opt-in) ==============
+
+PROFILE_TOP_ALLOCATIONS = 25
+PROFILE_TRACEBACK_FRAMES = 1
+PROFILE_OUTPUTS = {"cprofile": ".prof", "tracemalloc": ".tracemalloc.txt", "metrics": ".metrics.json"}
+
+def profile_statement(pdf_src, filename, profile_dir: Path, integer_cents: bool = False,
+                      metrics: Optional[Dict] = None,
+                      header_chars: Optional[int] = HEADER_REGION_CHARS) -> ParseResult:
+    """Parse satu dokumen sambil merekam cProfile dan snapshot tracemalloc.
+
+    Cache dilewati dan ekstraksi PDF serial supaya seluruh pekerjaan terekam di proses ini.
+    Output di profile_dir, semuanya diberi nama sha256 dokumen:
+    - ``<sha256>.prof``: dump cProfile (``python -m pstats`` / snakeviz)
+    - ``<sha256>.tracemalloc.txt``: alokasi terbesar yang masih hidup di akhir parse + peak
+    - ``<sha256>.metrics.json``: metrics parse
+    """
+    metrics = new_metrics(filename) if metrics is None else metrics
+    pdf_bytes = read_pdf_bytes(pdf_src)
+    digest = sha256_bytes(pdf_bytes)
+    profile_dir.mkdir(parents=True, exist_ok=True)
+
+    profiler = cProfile.Profile()
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(PROFILE_TRACEBACK_FRAMES)
+    tracemalloc.reset_peak()
+    try:
+        with _timed(metrics, "total"):
+            profiler.enable()
+            try:
+                result = _parse_statement(pdf_bytes, filename, None, 1, integer_cents, header_chars, metrics)
+            finally:
+                profiler.disable()
+        _, traced_peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ])
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+    paths = {kind: profile_dir / f"{digest}{suffix}" for kind, suffix in PROFILE_OUTPUTS.items()}
+    profiler.dump_stats(paths["cprofile"])
+    lines = [f"file: {filename}", f"sha256: {digest}", f"traced peak: {traced_peak / 1024:.1f} KiB", ""]
+    lines += [str(stat) for stat in snapshot.statistics("lineno")[:PROFILE_TOP_ALLOCATIONS]]
+    paths["tracemalloc"].write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    metrics["profile"] = {"sha256": digest, "traced_peak_bytes": traced_peak,
+                          **{kind: str(path) for kind, path in paths.items()}}
+    paths["metrics"].write_text(json.dumps(metrics, indent=2, default=str), encoding="utf-8")
+    return result
+
+def _parse_statement(pdf_src, filename, cache, pdf_workers, integer_cents, header_chars,
+                     metrics) -> ParseResult:
+    if cache is None:
+        return parse_bri_pages(stream_pdf_pages(pdf_src, workers=pdf_workers), filename, header_chars,
+                               integer_cents=integer_cents, metrics=metrics)
+
+    pdf_bytes = read_pdf_bytes(pdf_src)
+    digest = sha256_bytes(pdf_bytes)
+    # Nama file masih jadi cadangan kalau sniff_format tidak meyakinkan, jadi ikut menentukan key hasil
+    result_version = f"{PARSER_VERSION}-{detect_format_by_filename(filename)}"
+    if integer_cents:
+        result_version += "-cents"
+    # Potongan header yang berbeda bisa menghasilkan header/ringkasan berbeda
+    if header_chars != HEADER_REGION_CHARS:
+        result_version += f"-hc{header_chars}" if header_chars else "-hcfull"
+
+    with _timed(metrics, "cache_read"):
+        cached = cache.get_result(digest, result_version)
+    if cached is not None:
+        result, n_pages = cached
+        if n_pages is None:  # entri lama tanpa jumlah halaman di manifest
+            with _timed(metrics, "cache_read"):
+                cached_pages = cache.get_pages(digest)
+            n_pages = len(cached_pages) if cached_pages is not None else 0
+        metrics["cache"] = "result"
+        metrics["pages"] = n_pages
+        metrics["format"] = result[0].at[0, "Detected Format"] if "Detected Format" in result[0] else None
+        metrics["rows"] = len(result[2])
+        return ParseResult(result, metrics)
+
+    with _timed(metrics, "cache_read"):
+        cached_pages = cache.get_pages(digest)
+    if cached_pages is None:
+        metrics["cache"] = "miss"
+        pages: List[str] = []
+        source = _collect_pages(stream_pdf_pages(pdf_bytes, workers=pdf_workers), pages)
+    else:
+        metrics["cache"] = "pages"
+        pages = source = cached_pages
+
+    result = parse_bri_pages(source, filename, header_chars, integer_cents=integer_cents, metrics=metrics)
+    if pages:
+        with _timed(metrics, "cache_write"):
+            if cached_pages is None:
+                cache.put_pages(digest, pages)
+            cache.put_result(digest, result_version, result, pages=len(pages))
+    return result
+
+def _collect_pages(pages: Iterable[str], into: List[str]) -> Iterator[str]:
+    for page_text in pages:
+        into.append(page_text)
+        yield page_text
+
+def _decoded_pages(pages: Iterable[str], into: List[str], metrics: Dict) -> Iterator[str]:
+    """Teruskan halaman satu per satu; waktu menunggu halaman berikutnya masuk stages['pdf_text']."""
+    it = iter(pages)
+    while True:
+        with _timed(metrics, "pdf_text"):
+            page_text = next(it, None)
+        if page_text is None:
+            return
+        into.append(page_text)
+        yield page_text
+
+def parse_bri_pages(pages: Iterable[str], filename, header_chars: Optional[int] = HEADER_REGION_CHARS,
+                    integer_cents: bool = False, metrics: Optional[Dict] = None) -> ParseResult:
+    """pages boleh list atau iterator yang mendekode halaman saat dibaca (stream_pdf_pages).
+
+    Baris transaksi diparse sambil halaman berikutnya didekode; header & ringkasan
+    diambil setelahnya dari teks halaman yang sudah terkumpul.
+    """
+    metrics = new_metrics(filename) if metrics is None else metrics
+    decoded: List[str] = []
+    stream = _decoded_pages(pages, decoded, metrics)
+
+    # Format dari isi halaman pertama; nama file hanya dipakai kalau tidak meyakinkan.
+    # Cukup dekode sampai halaman pertama yang berisi, sisanya dibaca oleh parser baris
+    for page_text in stream:
+        if page_text.strip():
+            break
+    fmt = FORMATS[sniff_format(first_page_text(decoded)) or detect_format_by_filename(filename)]
+    metrics["format"] = fmt.name
+
+    # Baris transaksi dibaca per halaman, bukan dari split teks penuh
+    with _timed(metrics, "rows"):
+        decode_before = metrics["stages"].get("pdf_text", 0.0)
+        lines = iter_lines(chain(list(decoded), stream))
+        transactions = fmt.parse_rows(_counted(lines, metrics), integer_cents=integer_cents)
+        for _ in stream:  # parser yang berhenti lebih awal: header & cache tetap butuh semua halaman
+            pass
+        trx_df = transactions_frame(transactions)
+    # Dekode halaman di dalam loop baris dihitung sebagai pdf_text, bukan rows
+    metrics["stages"]["rows"] -= metrics["stages"].get("pdf_text", 0.0) - decode_before
+    metrics["rows"] = len(trx_df)
+    metrics["lines_rejected"] = metrics["lines_scanned"] - len(trx_df)
+
+    pages = decoded
+    metrics["pages"] = len(pages)
+
+    # Header & ringkasan dari potongan awal/akhir; teks penuh hanya kalau field wajib tidak ketemu.
+    # header_chars=None -> selalu teks penuh
+    region = header_region(pages, header_chars) if header_chars else join_pages(pages)
+    full_text = None
+
+    with _timed(metrics, "header"):
+        personal_info = fmt.extract_header(region)
+        if header_chars and _missing_fields(personal_info, fmt.required_fields):
+            metrics["header_full_text_fallback"] = True
+            full_text = join_pages(pages)
+            personal_info = fmt.extract_header(full_text)
+    with _timed(metrics, "summary"):
+        summary_info = fmt.extract_summary(region)
+        if header_chars and not summary_info:
+            full_text = join_pages(pages) if full_text is None else full_text
+            summary_info = fmt.extract_summary(full_text)
+
+    if integer_cents:
+        summary_info = summary_to_cents(summary_info)
+
+    partner_summary_df = pd.DataFrame()
+    partner_summary_table = pd.DataFrame()
+    analytics_df = pd.DataFrame()
+
+    if not trx_df.empty:
+        before = partner_cache_stats()
+        with _timed(metrics, "partners"):
+            partner_summary_df, partner_summary_table = analyze_bri_partners_unified(trx_df)
+        after = partner_cache_stats()
+        metrics["partner"] = {
+            "lru_hits": after["lru_hits"] - before["lru_hits"],
+            "lru_misses": after["lru_misses"] - before["lru_misses"],
+            "rule_hits": dict(Counter(after["rule_hits"]) - Counter(before["rule_hits"])),
+        }
+        with _timed(metrics, "analytics"):
+            base_stats_df = partner_summary_df if 'partner_name' in partner_summary_df.columns else trx_df
+            analytics_df = create_partner_statistics_summary(base_stats_df)
+
+    personal_df = pd.DataFrame([personal_info])
+    personal_df["Detected Format"] = fmt.name
+    summary_df  = pd.DataFrame([summary_info])
+
+    return ParseResult((personal_df, summary_df, trx_df, partner_summary_table, analytics_df), metrics)
@@ -0,0 +1,167 @@
+# bri_pdf.py
+import io
+import itertools
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Optional
+
+import pdfplumber
+
+logger = logging.getLogger(__name__)
+
+# Di bawah jumlah halaman ini biaya spawn worker lebih mahal dari ekstraksinya
+PARALLEL_MIN_PAGES = 16
+
+def available_cpus() -> int:
+    """CPU yang boleh dipakai proses ini (affinity / cgroup cpuset), bukan semua CPU mesin."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+DEFAULT_PDF_WORKERS = available_cpus()
+
+# ============== PDF Text Extraction ==============
+
+def _as_pool_source(pdf_src):
+    """Ubah sumber PDF menjadi sesuatu yang bisa dikirim ke worker (bytes / path)."""
+    if isinstance(pdf_src, (bytes, bytearray)):
+        return bytes(pdf_src)
+    if hasattr(pdf_src, "read"):  # BytesIO / file-like
+        if hasattr(pdf_src, "seek"):
+            pdf_src.seek(0)
+        return pdf_src.read()
+    return str(pdf_src)  # path string/Path
+
+def read_pdf_bytes(pdf_src) -> bytes:
+    src = _as_pool_source(pdf_src)
+    if isinstance(src, bytes):
+        return src
+    with open(src, "rb") as f:
+        return f.read()
+
+def _open_pdf(src):
+    if isinstance(src, (bytes, bytearray)):
+        return pdfplumber.open(io.BytesIO(src))
+    return pdfplumber.open(src)
+
+def _page_text(page) -> str:
+    """Teks satu halaman, lalu lepas objek char/layout-nya.
+
+    Page.close() di pdfplumber 0.11 tidak mengosongkan cache get_textmap, padahal cache
+    itu yang memegang semua char halaman; tanpa cache_clear semuanya hidup sampai gc.
+    """
+    try:
+        return page.extract_text() or ""
+    finally:
+        page.get_textmap.cache_clear()
+        page.close()
+
+def _extract_page_range(src, start: int, stop: int) -> List[str]:
+    """Worker: buka PDF yang sama dan ekstrak teks halaman [start, stop)."""
+    with _open_pdf(src) as pdf:
+        return [_page_text(pdf.pages[i]) for i in range(start, stop)]
+
+def _page_ranges(n_pages: int, workers: int):
+    step, extra = divmod(n_pages, workers)
+    start = 0
+    for w in range(workers):
+        stop = start + step + (1 if w < extra else 0)
+        if stop > start:
+            yield start, stop
+        start = stop
+
+def _pool_context():
+    """fork tidak aman kalau proses ini punya thread lain (mis. server Streamlit): pakai spawn."""
+    if threading.active_count() > 1:
+        return multiprocessing.get_context("spawn")
+    return None
+
+def _page_count(src) -> int:
+    try:
+        with _open_pdf(src) as pdf:
+            return len(pdf.pages)
+    except Exception:
+        return 0  # iter_pdf_pages yang mencatat error-nya
+
+def read_pdf_pages(pdf_src, workers: Optional[int] = None) -> List[str]:
+    """Teks per halaman, urut sesuai halaman.
+
+    workers=None memakai DEFAULT_PDF_WORKERS; workers<=1 atau dokumen pendek
+    diproses serial. Kalau process pool gagal, otomatis kembali ke serial.
+    PDF rusak: error dicatat dan halaman yang sudah terbaca tetap dikembalikan
+    (PDF yang tidak bisa dibuka sama sekali -> list kosong), sama di kedua jalur.
+    """
+    workers = DEFAULT_PDF_WORKERS if workers is None else workers
+    src = _as_pool_source(pdf_src)
+    n_pages = _page_count(src) if workers > 1 else 0
+    if n_pages < PARALLEL_MIN_PAGES:
+        return list(iter_pdf_pages(src))
+    return list(_stream_parallel(src, n_pages, workers))
+
+def _stream_parallel(src, n_pages: int, workers: int) -> Iterator[str]:
+    """Halaman 1 didekode di proses ini sementara worker mengerjakan sisanya.
+
+    Format sudah bisa di-sniff dari halaman 1 sebelum sebagian besar dokumen selesai
+    didekode; halaman berikutnya keluar per rentang worker, urut. Kalau pool gagal,
+    sisa halaman dilanjutkan serial dari halaman yang belum keluar.
+    """
+    workers = min(workers, n_pages - 1)
+    done = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()) as pool:
+            futures = [pool.submit(_extract_page_range, src, start + 1, stop + 1)
+                       for start, stop in _page_ranges(n_pages - 1, workers)]
+            chunks = itertools.chain([_extract_page_range(src, 0, 1)], (fut.result() for fut in futures))
+            for chunk in chunks:
+                yield from chunk
+                done += len(chunk)
+    except Exception as e:
+        logger.warning("Parallel PDF extraction failed, falling back to serial: %s", e)
+        yield from iter_pdf_pages(src, start=done)
+
+def stream_pdf_pages(pdf_src, workers: Optional[int] = None) -> Iterator[str]:
+    """Teks per halaman untuk diparse sambil jalan.
+
+    Jalur serial (workers<=1 atau dokumen pendek) mendekode halaman saat iterator
+    dikonsumsi, jadi objek layout pdfplumber yang hidup paling banyak satu halaman.
+    Dokumen panjang dengan workers>1 didekode paralel per rentang halaman, dengan
+    halaman 1 lebih dulu (lihat _stream_parallel).
+    """
+    workers = DEFAULT_PDF_WORKERS if workers is None else workers
+    src = _as_pool_source(pdf_src)
+    n_pages = _page_count(src) if workers > 1 else 0
+    if n_pages < PARALLEL_MIN_PAGES:
+        return iter_pdf_pages(src)
+    return _stream_parallel(src, n_pages, workers)
+
+def iter_pdf_pages(pdf_src, start: int = 0) -> Iterator[str]:
+    """Yield teks per halaman secara lazy; cache layout halaman dilepas setelah dibaca.
+
+    Error di tengah dokumen dicatat lalu iterasi berhenti; halaman sebelumnya tetap terpakai.
+    """
+    src = _as_pool_source(pdf_src)
+    try:
+        with _open_pdf(src) as pdf:
+            for page in pdf.pages[start:]:
+                yield _page_text(page)
+    except Exception as e:
+        logger.warning("Error reading PDF: %s", e)
+
+def iter_page_lines(pages: Iterable[str]) -> Iterator[List[str]]:
+    """Satu list baris per halaman."""
+    for page_text in pages:
+        yield page_text.split("\n") if page_text else []
+
+def iter_lines(pages: Iterable[str]) -> Iterator[str]:
+    """Semua baris dokumen secara berurutan tanpa menggabungkan teks halaman."""
+    for lines in iter_page_lines(pages):
+        yield from lines
+
+def join_pages(pages: Iterable[str]) -> str:
+    return "".join(page_text + "\n" for page_text in pages if page_text)
+
+def read_pdf_to_text(pdf_src, workers: Optional[int] = None) -> str:
+    return join_pages(read_pdf_pages(pdf_src, workers=workers))